@@ -4,17 +4,21 @@ Generate action plans and evidence schedules from mappings
 """
 
 from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 import logging
 
 from agents.mapper import ControlMapping
-from agents.extractor import Obligation
+from agents.extractor import Obligation, SEVERITY_NAMES, SEVERITY_CODES, SEVERITY_HIGH, SEVERITY_LOW
 
 logger = logging.getLogger(__name__)
 
+# Days until due, indexed by priority code (low, medium, high)
+_MAP_DAYS = (60, 30, 14)
+_GAP_DAYS = (30, 14, 7)  # Gaps are urgent
 
-@dataclass
+
+@dataclass(slots=True)
 class Action:
     """Represents an action item"""
     summary: str
@@ -22,25 +26,30 @@ class Action:
     control_id: str
     owner: str
     due_date: str
-    priority: str  # 'high', 'medium', 'low'
+    priority: int  # SEVERITY_LOW, SEVERITY_MEDIUM, SEVERITY_HIGH
     system: str
     status: str = 'planned'
+    _preview: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Truncated obligation text for serialization, built once
+        self._preview = self.obligation_text[:150] + '...'
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
         return {
             'summary': self.summary,
-            'obligation_text': self.obligation_text[:150] + '...',
+            'obligation_text': self._preview,
             'control_id': self.control_id,
             'owner': self.owner,
             'due_date': self.due_date,
-            'priority': self.priority,
+            'priority': SEVERITY_NAMES[self.priority],
             'system': self.system,
             'status': self.status
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class EvidenceRun:
     """Represents a recurring evidence collection schedule"""
     control_id: str
@@ -86,48 +95,61 @@ class ActionsAgent:
         """
         actions = []
         control_lookup = {ctrl.control_id: ctrl for ctrl in controls_catalog}
+        due_lookup = self._build_due_lookup(datetime.utcnow())
+        
+        # Bucket accepted mappings per section once
+        accepted_by_section = {
+            section_id: [m for m in section_mappings if m.status == 'accepted']
+            for section_id, section_mappings in mappings.items()
+        }
         
         for obligation in obligations:
-            section_mappings = mappings.get(obligation.section_id, [])
-            
-            # Get accepted mappings
-            accepted = [m for m in section_mappings if m.status == 'accepted']
+            accepted = accepted_by_section.get(obligation.section_id, ())
             
             if not accepted:
                 # Create action for unmapped obligation
-                action = self._create_gap_action(obligation)
+                action = self._create_gap_action(obligation, due_lookup)
                 actions.append(action)
             else:
                 # Create actions for each accepted mapping
                 for mapping in accepted:
-                    control = control_lookup.get(mapping.control_id)
-                    if control:
-                        action = self._create_mapping_action(
-                            obligation, mapping, control
-                        )
-                        actions.append(action)
+                    try:
+                        control = control_lookup[mapping.control_id]
+                    except KeyError:
+                        continue
+                    
+                    action = self._create_mapping_action(
+                        obligation, mapping, control, due_lookup
+                    )
+                    actions.append(action)
         
         logger.info(f"Generated {len(actions)} actions")
         return actions
     
+    def _build_due_lookup(self, now: datetime) -> Dict[tuple, str]:
+        """
+        Precompute due date strings keyed by (kind, priority code)
+        """
+        return {
+            (kind, priority): (now + timedelta(days=days)).strftime('%Y-%m-%d')
+            for kind, days_by_priority in (('map', _MAP_DAYS), ('gap', _GAP_DAYS))
+            for priority, days in enumerate(days_by_priority)
+        }
+    
     def _create_mapping_action(self,
                                obligation: Obligation,
                                mapping: ControlMapping,
-                               control: Any) -> Action:
+                               control: Any,
+                               due_lookup: Optional[Dict[tuple, str]] = None) -> Action:
         """Create action for a mapped obligation"""
         
         # Determine priority from obligation severity
         priority = obligation.severity
         
         # Calculate due date based on priority
-        if priority == 'high':
-            days = 14
-        elif priority == 'medium':
-            days = 30
-        else:
-            days = 60
-        
-        due_date = (datetime.utcnow() + timedelta(days=days)).strftime('%Y-%m-%d')
+        if due_lookup is None:
+            due_lookup = self._build_due_lookup(datetime.utcnow())
+        due_date = due_lookup.get(('map', priority), due_lookup[('map', SEVERITY_LOW)])
         
         # Generate summary
         summary = f"Implement/verify {control.title} for new obligation"
@@ -143,20 +165,17 @@ class ActionsAgent:
             status='planned'
         )
     
-    def _create_gap_action(self, obligation: Obligation) -> Action:
+    def _create_gap_action(self,
+                           obligation: Obligation,
+                           due_lookup: Optional[Dict[tuple, str]] = None) -> Action:
         """Create action for unmapped (gap) obligation"""
         
         priority = obligation.severity
         
         # Gaps are urgent
-        if priority == 'high':
-            days = 7
-        elif priority == 'medium':
-            days = 14
-        else:
-            days = 30
-        
-        due_date = (datetime.utcnow() + timedelta(days=days)).strftime('%Y-%m-%d')
+        if due_lookup is None:
+            due_lookup = self._build_due_lookup(datetime.utcnow())
+        due_date = due_lookup.get(('gap', priority), due_lookup[('gap', SEVERITY_LOW)])
         
         summary = "REVIEW: New obligation without control mapping"
         
@@ -166,7 +185,7 @@ class ActionsAgent:
             control_id="GAP",
             owner="Compliance Team",
             due_date=due_date,
-            priority='high',  # Always high priority for gaps
+            priority=SEVERITY_HIGH,  # Always high priority for gaps
             system="Compliance",
             status='review_required'
         )
@@ -195,11 +214,12 @@ class ActionsAgent:
         
         cron_expr = cadence_map.get(cadence_preset, cadence_map['quarterly'])
         
+        # Next run depends only on cadence and today's date
+        next_run = self._calculate_next_run(cadence_preset)
+        
         for control in controls_used:
             # Create schedule for each evidence example
             for artefact in control.evidence_examples[:2]:  # Limit to top 2
-                next_run = self._calculate_next_run(cadence_preset)
-                
                 evidence_run = EvidenceRun(
                     control_id=control.control_id,
                     artefact=artefact,
@@ -254,20 +274,30 @@ class ActionsAgent:
                 'gaps': 0
             }
         
+        priority_counts = [0] * len(SEVERITY_NAMES)
+        by_status = {'planned': 0, 'review_required': 0}
+        owners = set()
+        systems = set()
+        gaps = 0
+        
+        # Single pass over actions
+        for a in actions:
+            priority_counts[a.priority] += 1
+            by_status[a.status] = by_status.get(a.status, 0) + 1
+            owners.add(a.owner)
+            systems.add(a.system)
+            if a.control_id == 'GAP':
+                gaps += 1
+        
         summary = {
             'total': len(actions),
             'by_priority': {
-                'high': sum(1 for a in actions if a.priority == 'high'),
-                'medium': sum(1 for a in actions if a.priority == 'medium'),
-                'low': sum(1 for a in actions if a.priority == 'low')
+                name: priority_counts[SEVERITY_CODES[name]] for name in ('high', 'medium', 'low')
             },
-            'by_status': {
-                'planned': sum(1 for a in actions if a.status == 'planned'),
-                'review_required': sum(1 for a in actions if a.status == 'review_required')
-            },
-            'gaps': sum(1 for a in actions if a.control_id == 'GAP'),
-            'unique_owners': len(set(a.owner for a in actions)),
-            'unique_systems': len(set(a.system for a in actions))
+            'by_status': by_status,
+            'gaps': gaps,
+            'unique_owners': len(owners),
+            'unique_systems': len(systems)
         }
         
         return summary
@@ -281,17 +311,21 @@ class ActionsAgent:
                 'unique_owners': 0
             }
         
+        control_ids = set()
+        by_owner = {}
+        
+        # Single pass over evidence runs
+        for run in evidence_runs:
+            control_ids.add(run.control_id)
+            by_owner[run.owner] = by_owner.get(run.owner, 0) + 1
+        
         summary = {
             'total': len(evidence_runs),
-            'unique_controls': len(set(e.control_id for e in evidence_runs)),
-            'unique_owners': len(set(e.owner for e in evidence_runs)),
-            'by_owner': {}
+            'unique_controls': len(control_ids),
+            'unique_owners': len(by_owner),
+            'by_owner': by_owner
         }
         
-        # Count by owner
-        for run in evidence_runs:
-            summary['by_owner'][run.owner] = summary['by_owner'].get(run.owner, 0) + 1
-        
         return summary
 
 
@@ -3,22 +3,75 @@ RegDelta Extractor Agent
 Rule-based obligation extraction using lexicon patterns
 """
 
+import os
 import re
+import hashlib
+import numpy as np
 import yaml
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator, Sequence
 from dataclasses import dataclass
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Worker processes are started from a clean server process rather than
+# forked from this (possibly multi-threaded) one, where a lock held by another
+# thread at fork time, e.g. a logging handler's, would deadlock the child
+_POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
 
-@dataclass
+# Prefer the libyaml-backed parser when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Severity/priority levels are stored as small ints (index into SEVERITY_NAMES)
+# and only converted to names at to_dict/display boundaries
+SEVERITY_NAMES = ('low', 'medium', 'high')
+SEVERITY_CODES = {name: code for code, name in enumerate(SEVERITY_NAMES)}
+SEVERITY_LOW, SEVERITY_MEDIUM, SEVERITY_HIGH = range(len(SEVERITY_NAMES))
+
+# Characters that make a lexicon phrase a regex rather than plain text
+_REGEX_META_RE = re.compile(r'[\\.^$*+?{}\[\]|()]')
+
+# Citation references (Section 4.2, Article 5, ...)
+_CITATION_RE = re.compile(
+    r'(?:Section|Article|Clause|Paragraph|Regulation)\s+\d+(?:\.\d+)*',
+    re.IGNORECASE
+)
+
+# Word tokens, matching the boundaries of the \b-anchored keyword patterns
+_TOKEN_RE = re.compile(r'\w+')
+
+
+def _hs_word_bounded(phrase: str) -> str:
+    """
+    Hyperscan expression matching wherever \b<phrase>\b matches under re
+    
+    Hyperscan rejects \b in UCP (Unicode) mode, so each boundary becomes the
+    neighbouring character class it implies: a non-word character or the
+    edge of the text next to a word character, and a word character next
+    to a non-word one. The database only reports whether an expression hit,
+    so consuming that neighbour does not change the result.
+    """
+    def boundary(ch: str, edge: str) -> str:
+        return rf'(?:{edge}|\W)' if _TOKEN_RE.match(ch) else r'\w'
+    
+    return boundary(phrase[0], '^') + re.escape(phrase) + boundary(phrase[-1], '$')
+
+
+@dataclass(slots=True)
 class Obligation:
     """Represents an extracted obligation"""
     section_id: str
     text: str
-    severity: str  # 'high', 'medium', 'low'
+    severity: int  # SEVERITY_LOW, SEVERITY_MEDIUM, SEVERITY_HIGH
     citations: List[str]
     modal_phrases: List[str]
     has_deadline: bool
@@ -28,23 +81,100 @@ class Obligation:
         return {
             'section_id': self.section_id,
             'text': self.text,
-            'severity': self.severity,
+            'severity': SEVERITY_NAMES[self.severity],
             'citations': self.citations,
             'modal_phrases': self.modal_phrases,
             'has_deadline': self.has_deadline
         }
 
 
+class ObligationBatch:
+    """
+    Structure-of-arrays container for extracted obligations
+    
+    Scalar fields read by summaries (severity, has_deadline) are stored as
+    NumPy arrays; iterating or indexing yields Obligation views on demand so
+    the batch can be used wherever a list of obligations is expected.
+    """
+    
+    def __init__(self,
+                 section_ids: Sequence[str] = (),
+                 texts: Sequence[str] = (),
+                 severities: Sequence[int] = (),
+                 citations: Sequence[List[str]] = (),
+                 modal_phrases: Sequence[List[str]] = (),
+                 has_deadline: Sequence[bool] = ()):
+        self.section_ids: List[str] = list(section_ids)
+        self.texts: List[str] = list(texts)
+        self.severities = np.asarray(severities, dtype=np.int8)
+        self.citations: List[List[str]] = list(citations)
+        self.modal_phrases: List[List[str]] = list(modal_phrases)
+        self.has_deadline = np.asarray(has_deadline, dtype=bool)
+    
+    @classmethod
+    def from_obligations(cls, obligations: Sequence[Obligation]) -> 'ObligationBatch':
+        """Create batch from a list of Obligation objects"""
+        return cls(
+            section_ids=[o.section_id for o in obligations],
+            texts=[o.text for o in obligations],
+            severities=[o.severity for o in obligations],
+            citations=[o.citations for o in obligations],
+            modal_phrases=[o.modal_phrases for o in obligations],
+            has_deadline=[o.has_deadline for o in obligations]
+        )
+    
+    def __len__(self) -> int:
+        return len(self.section_ids)
+    
+    def __getitem__(self, idx: int) -> Obligation:
+        return Obligation(
+            section_id=self.section_ids[idx],
+            text=self.texts[idx],
+            severity=int(self.severities[idx]),
+            citations=self.citations[idx],
+            modal_phrases=self.modal_phrases[idx],
+            has_deadline=bool(self.has_deadline[idx])
+        )
+    
+    def __iter__(self) -> Iterator[Obligation]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+
 class ExtractorAgent:
     """Rule-based obligation extractor"""
     
+    # Paragraph count above which extraction with n_workers > 1 is sharded
+    # across processes. Serial extraction costs ~13 µs per paragraph, while
+    # starting a pool and rebuilding the extractor in each worker costs
+    # ~0.5 s, so a pool of 4 only breaks even around 50k paragraphs
+    PARALLEL_MIN_PARAGRAPHS = 50_000
+    
     def __init__(self, lexicon_file: Path):
+        self.lexicon_file = lexicon_file
         self.lexicon = self._load_lexicon(lexicon_file)
         self.modal_patterns = self._compile_modal_patterns()
-        self.severity_patterns = self._compile_severity_patterns()
+        self.modal_category_patterns = self._compile_modal_category_patterns()
+        self.severity_tokens, self.severity_patterns = self._compile_severity_tables()
         self.deadline_patterns = self._compile_deadline_patterns()
         self.stop_patterns = self._compile_stop_patterns()
         
+        # Lowercase phrase lists used by substring checks
+        modal_lexicon = self.lexicon.get('modal_phrases', {})
+        self._prohibitions_lc = [p.lower() for p in modal_lexicon.get('prohibitions', [])]
+        self._mandatory_lc = [p.lower() for p in modal_lexicon.get('mandatory', [])]
+        
+        # Lowercase literals for the cheap paragraph pre-filter
+        self._modal_keywords = [phrase.lower() for phrase, _ in self.modal_patterns]
+        self._stop_literals = [
+            phrase.lower() for phrase in self.lexicon.get('stop_phrases', [])
+            if not _REGEX_META_RE.search(phrase)  # plain text, no regex syntax
+        ]
+        
+        # Optional single-pass multi-pattern scanner (None if hyperscan unavailable)
+        self.pattern_meta: List[tuple[str, int]] = []
+        self.scan_db = self._build_scan_database()
+        
         logger.info(f"ExtractorAgent initialized with {len(self.modal_patterns)} modal patterns")
     
     def _load_lexicon(self, lexicon_file: Path) -> Dict[str, Any]:
@@ -53,7 +183,7 @@ class ExtractorAgent:
             raise FileNotFoundError(f"Lexicon file not found: {lexicon_file}")
         
         with open(lexicon_file, 'r', encoding='utf-8') as f:
-            return yaml.safe_load(f)
+            return yaml.load(f, Loader=_YamlLoader)
     
     def _compile_modal_patterns(self) -> List[tuple[str, re.Pattern]]:
         """Compile modal phrase patterns"""
@@ -67,17 +197,53 @@ class ExtractorAgent:
         
         return patterns
     
-    def _compile_severity_patterns(self) -> Dict[str, List[re.Pattern]]:
-        """Compile severity keyword patterns"""
+    def _compile_alternation(self, phrases: List[str]) -> re.Pattern:
+        """Compile phrases into one word-bounded, case-insensitive alternation"""
+        # Longest first so shared prefixes ("must not" / "must") prefer the longer phrase
+        ordered = sorted(phrases, key=len, reverse=True)
+        return re.compile(
+            r'\b(?:' + '|'.join(re.escape(p) for p in ordered) + r')\b',
+            re.IGNORECASE
+        )
+    
+    def _compile_modal_category_patterns(self) -> List[tuple[re.Pattern, List[tuple[str, re.Pattern]]]]:
+        """
+        Group modal patterns by category behind one combined pattern each
+        
+        The combined pattern answers "any phrase in this category?" with a
+        single search; per-phrase patterns are only consulted for categories
+        that hit, since overlapping phrases must all be reported.
+        """
+        grouped = []
+        phrase_patterns = iter(self.modal_patterns)
+        
+        for category, phrases in self.lexicon.get('modal_phrases', {}).items():
+            if not phrases:
+                continue
+            category_patterns = [next(phrase_patterns) for _ in phrases]
+            grouped.append((self._compile_alternation(phrases), category_patterns))
+        
+        return grouped
+    
+    def _compile_severity_tables(self) -> tuple[Dict[str, frozenset], Dict[str, List[re.Pattern]]]:
+        """
+        Compile severity keywords into lookup tables
+        
+        Single-word keywords go into a per-severity token set so a text only
+        needs to be tokenized once; multi-word keywords (e.g. "must not") are
+        combined into one alternation per severity.
+        """
+        tokens = {}
         patterns = {}
         
         for severity, keywords in self.lexicon.get('severity_keywords', {}).items():
-            patterns[severity] = [
-                re.compile(r'\b' + re.escape(kw) + r'\b', re.IGNORECASE)
-                for kw in keywords
-            ]
+            tokens[severity] = frozenset(
+                kw.lower() for kw in keywords if _TOKEN_RE.fullmatch(kw)
+            )
+            phrases = [kw for kw in keywords if not _TOKEN_RE.fullmatch(kw)]
+            patterns[severity] = [self._compile_alternation(phrases)] if phrases else []
         
-        return patterns
+        return tokens, patterns
     
     def _compile_deadline_patterns(self) -> List[re.Pattern]:
         """Compile deadline detection patterns"""
@@ -97,6 +263,133 @@ class ExtractorAgent:
         
         return patterns
     
+    def _build_scan_database(self):
+        """
+        Compile all lexicon patterns into one Hyperscan database
+        
+        Each expression ID indexes into self.pattern_meta, which holds a
+        (category, index) tag so hits can be dispatched after a single scan.
+        The compiled database is cached next to the lexicon, keyed by a hash
+        of the expressions. Falls back to per-pattern regex matching if
+        hyperscan is not installed.
+        """
+        try:
+            import hyperscan
+        except ImportError:
+            logger.debug("hyperscan not installed, using per-pattern regex matching")
+            return None
+        
+        expressions = []
+        
+        for idx, (phrase, _) in enumerate(self.modal_patterns):
+            expressions.append((_hs_word_bounded(phrase), ('modal', idx)))
+        
+        for severity in ('high', 'medium'):
+            for kw in self.lexicon.get('severity_keywords', {}).get(severity, []):
+                expressions.append((_hs_word_bounded(kw), (severity, 0)))
+        
+        for pattern_str in self.lexicon.get('deadline_patterns', []):
+            expressions.append((pattern_str, ('deadline', 0)))
+        
+        for phrase in self.lexicon.get('stop_phrases', []):
+            expressions.append((phrase, ('stop', 0)))
+        
+        if not expressions:
+            return None
+        
+        # UCP gives \b, \w and case folding Unicode semantics, as in re;
+        # the flags are part of the cache key, so older databases are rebuilt
+        flags = (hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH
+                 | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_UCP)
+        
+        cache_path = self.lexicon_file.with_suffix('.hsdb')
+        cache_key = hashlib.sha256(
+            repr((hyperscan.__version__, flags, expressions)).encode('utf-8')
+        ).hexdigest().encode('ascii')
+        
+        db = self._load_cached_scan_database(hyperscan, cache_path, cache_key)
+        
+        if db is None:
+            try:
+                db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+                db.compile(
+                    expressions=[expr.encode('utf-8') for expr, _ in expressions],
+                    ids=list(range(len(expressions))),
+                    elements=len(expressions),
+                    flags=[flags] * len(expressions)
+                )
+            except hyperscan.error as e:
+                logger.warning(f"Failed to compile hyperscan database, using regex matching: {e}")
+                return None
+            
+            logger.info(f"Compiled {len(expressions)} lexicon patterns into hyperscan database")
+            
+            try:
+                # Write-then-rename so concurrent workers never read a partial file
+                tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+                tmp_path.write_bytes(cache_key + hyperscan.dumpb(db))
+                os.replace(tmp_path, cache_path)
+            except OSError as e:
+                logger.debug(f"Could not write hyperscan cache {cache_path}: {e}")
+        
+        self.pattern_meta = [meta for _, meta in expressions]
+        return db
+    
+    def _load_cached_scan_database(self, hyperscan, cache_path: Path, cache_key: bytes):
+        """Load a serialized hyperscan database if its key matches"""
+        try:
+            data = cache_path.read_bytes()
+        except OSError:
+            return None
+        
+        if not data.startswith(cache_key):
+            return None
+        
+        try:
+            db = hyperscan.loadb(data[len(cache_key):], hyperscan.HS_MODE_BLOCK)
+            db.scratch = hyperscan.Scratch(db)  # Not restored by loadb
+        except hyperscan.error as e:
+            # Serialized databases are platform specific
+            logger.debug(f"Ignoring unusable hyperscan cache {cache_path}: {e}")
+            return None
+        
+        logger.info(f"Loaded hyperscan database from cache {cache_path}")
+        return db
+    
+    def _scan_lexicon(self, text: str) -> Dict[str, set]:
+        """Scan text once and bucket pattern hits by lexicon category"""
+        hits = {'modal': set(), 'high': set(), 'medium': set(), 'deadline': set(), 'stop': set()}
+        
+        def on_match(pattern_id, start, end, flags, context):
+            category, idx = self.pattern_meta[pattern_id]
+            hits[category].add(idx)
+        
+        # PDF text can carry lone surrogates; only pattern ids are used, so
+        # replacing them (with a non-word character, as they are to re)
+        # keeps the input valid UTF-8 without changing any match
+        self.scan_db.scan(text.encode('utf-8', errors='replace'), match_event_handler=on_match)
+        return hits
+    
+    def _is_candidate(self, text: str, min_length: int = 30) -> bool:
+        """
+        Cheap substring pre-filter run before the full pattern battery
+        
+        A paragraph without any modal phrase substring cannot match a modal
+        pattern, and one containing a literal stop phrase is always rejected.
+        """
+        if len(text) < min_length:
+            return False
+        
+        text_lower = text.lower()
+        
+        if not any(kw in text_lower for kw in self._modal_keywords):
+            return False
+        
+        if any(sp in text_lower for sp in self._stop_literals):
+            return False
+        
+        return True
+    
     def _is_stop_phrase(self, text: str) -> bool:
         """Check if text matches stop phrases (should be excluded)"""
         for pattern in self.stop_patterns:
@@ -104,13 +397,22 @@ class ExtractorAgent:
                 return True
         return False
     
+    def _has_any_modal(self, text: str) -> bool:
+        """Check if text contains at least one modal phrase"""
+        return any(cat_pattern.search(text) for cat_pattern, _ in self.modal_category_patterns)
+    
     def _detect_modal_phrases(self, text: str) -> List[str]:
         """Detect modal phrases in text"""
         found_phrases = []
         
-        for phrase, pattern in self.modal_patterns:
-            if pattern.search(text):
-                found_phrases.append(phrase)
+        for cat_pattern, phrase_patterns in self.modal_category_patterns:
+            # Skip the whole category with one search
+            if not cat_pattern.search(text):
+                continue
+            
+            for phrase, pattern in phrase_patterns:
+                if pattern.search(text):
+                    found_phrases.append(phrase)
         
         return found_phrases
     
@@ -121,7 +423,24 @@ class ExtractorAgent:
                 return True
         return False
     
-    def _determine_severity(self, text: str, modal_phrases: List[str], has_deadline: bool) -> str:
+    def _severity_keyword_hits(self, text: str) -> set:
+        """Return the severity levels whose keywords appear in text"""
+        text_tokens = set(_TOKEN_RE.findall(text.lower()))
+        hits = set()
+        
+        for severity in ('high', 'medium'):
+            if not self.severity_tokens.get(severity, frozenset()).isdisjoint(text_tokens):
+                hits.add(severity)
+            elif any(p.search(text) for p in self.severity_patterns.get(severity, [])):
+                hits.add(severity)
+        
+        return hits
+    
+    def _determine_severity(self,
+                            text: str,
+                            modal_phrases: List[str],
+                            has_deadline: bool,
+                            keyword_hits: Optional[set] = None) -> int:
         """
         Determine obligation severity based on keywords and context
         
@@ -129,40 +448,92 @@ class ExtractorAgent:
         - High: Contains high-severity keywords, prohibitions, or time-critical requirements
         - Medium: Contains mandatory keywords (must/shall/required)
         - Low: Contains recommended keywords (should/advised)
+        
+        keyword_hits is the set of severity levels whose keywords matched in a
+        prior lexicon scan; if None, it is computed from the keyword tables.
         """
         text_lower = text.lower()
         
+        if keyword_hits is None:
+            keyword_hits = self._severity_keyword_hits(text)
+        
         # Check high severity keywords
-        for pattern in self.severity_patterns.get('high', []):
-            if pattern.search(text):
-                return 'high'
+        if 'high' in keyword_hits:
+            return SEVERITY_HIGH
         
         # Check if it's a prohibition (must not, shall not, etc.)
-        prohibition_phrases = self.lexicon.get('modal_phrases', {}).get('prohibitions', [])
-        for phrase in prohibition_phrases:
-            if phrase.lower() in text_lower:
-                return 'high'
+        if any(phrase in text_lower for phrase in self._prohibitions_lc):
+            return SEVERITY_HIGH
         
         # Time-bound requirements get boosted severity
-        if has_deadline:
-            # Check medium severity keywords
-            for pattern in self.severity_patterns.get('medium', []):
-                if pattern.search(text):
-                    return 'high'  # Boost to high if deadline + mandatory
+        has_medium_keyword = 'medium' in keyword_hits
+        if has_deadline and has_medium_keyword:
+            return SEVERITY_HIGH  # Boost to high if deadline + mandatory
         
         # Check medium severity keywords
-        for pattern in self.severity_patterns.get('medium', []):
-            if pattern.search(text):
-                return 'medium'
+        if has_medium_keyword:
+            return SEVERITY_MEDIUM
         
         # Check if mandatory modal phrases present
-        mandatory_phrases = self.lexicon.get('modal_phrases', {}).get('mandatory', [])
-        for phrase in mandatory_phrases:
-            if phrase.lower() in text_lower:
-                return 'medium'
+        if any(phrase in text_lower for phrase in self._mandatory_lc):
+            return SEVERITY_MEDIUM
         
         # Default to low for recommendations
-        return 'low'
+        return SEVERITY_LOW
+    
+    def _analyze_section(self, section_text: str, min_length: int = 30) -> Optional[tuple]:
+        """
+        Run the lexicon checks on a section of text
+        
+        Returns:
+            (severity, citations, modal_phrases, has_deadline), or None if the
+            text is not an obligation
+        """
+        # Skip if too short
+        if len(section_text) < min_length:
+            return None
+        
+        keyword_hits = None
+        
+        if self.scan_db is not None:
+            # Single pass over the text for all lexicon categories
+            hits = self._scan_lexicon(section_text)
+            if hits['stop']:
+                return None
+            
+            modal_phrases = [self.modal_patterns[idx][0] for idx in sorted(hits['modal'])]
+            has_deadline = bool(hits['deadline'])
+            keyword_hits = {sev for sev in ('high', 'medium') if hits[sev]}
+        else:
+            # Cheap early exit: stop at the first modal hit
+            if not self._has_any_modal(section_text):
+                return None
+            
+            # Skip stop phrases
+            if self._is_stop_phrase(section_text):
+                return None
+            
+            # Enumerate all modal phrases only for retained sections
+            modal_phrases = self._detect_modal_phrases(section_text)
+            has_deadline = None
+        
+        # If no modal phrases found, not an obligation
+        if not modal_phrases:
+            return None
+        
+        # Check for deadline
+        if has_deadline is None:
+            has_deadline = self._has_deadline(section_text)
+        
+        # Determine severity
+        severity = self._determine_severity(
+            section_text, modal_phrases, has_deadline, keyword_hits
+        )
+        
+        # Extract citations (simple regex for common patterns)
+        citations = self._extract_citations(section_text)
+        
+        return severity, citations, modal_phrases, has_deadline
     
     def extract_obligations(self, 
                           section_text: str, 
@@ -181,25 +552,11 @@ class ExtractorAgent:
         """
         obligations = []
         
-        # Skip if too short or is stop phrase
-        if len(section_text) < min_length or self._is_stop_phrase(section_text):
-            return obligations
-        
-        # Detect modal phrases
-        modal_phrases = self._detect_modal_phrases(section_text)
-        
-        # If no modal phrases found, not an obligation
-        if not modal_phrases:
+        result = self._analyze_section(section_text, min_length)
+        if result is None:
             return obligations
         
-        # Check for deadline
-        has_deadline = self._has_deadline(section_text)
-        
-        # Determine severity
-        severity = self._determine_severity(section_text, modal_phrases, has_deadline)
-        
-        # Extract citations (simple regex for common patterns)
-        citations = self._extract_citations(section_text)
+        severity, citations, modal_phrases, has_deadline = result
         
         # Create obligation
         obligation = Obligation(
@@ -212,50 +569,87 @@ class ExtractorAgent:
         )
         
         obligations.append(obligation)
-        logger.debug(f"Extracted {severity} obligation from section {section_id}")
+        logger.debug(f"Extracted {SEVERITY_NAMES[severity]} obligation from section {section_id}")
         
         return obligations
     
     def _extract_citations(self, text: str) -> List[str]:
-        """Extract citation references from text"""
-        citations = []
-        
-        # Common citation patterns
-        patterns = [
-            r'Section\s+\d+(?:\.\d+)*',
-            r'Article\s+\d+(?:\.\d+)*',
-            r'Clause\s+\d+(?:\.\d+)*',
-            r'Paragraph\s+\d+(?:\.\d+)*',
-            r'Regulation\s+\d+(?:\.\d+)*',
+        """Extract citation references (Section/Article/Clause/...) from text"""
+        # Remove duplicates, keeping first-occurrence order
+        return list(dict.fromkeys(m.group(0) for m in _CITATION_RE.finditer(text)))
+    
+    def _extract_rows(self, paragraphs: List[str], offset: int = 0) -> List[tuple]:
+        """
+        Extract obligation rows from a run of paragraphs
+        
+        Returns:
+            List of (section_id, text, severity, citations, modal_phrases, has_deadline)
+        """
+        rows = []
+        
+        for idx, para in enumerate(paragraphs, start=offset):
+            if not self._is_candidate(para):
+                continue
+            
+            result = self._analyze_section(para)
+            if result is None:
+                continue
+            
+            rows.append((f"para_{idx}", para) + result)
+        
+        return rows
+    
+    def _extract_rows_parallel(self, paragraphs: List[str], n_workers: int) -> List[tuple]:
+        """Extract rows across contiguous paragraph shards in a process pool"""
+        shard_size = -(-len(paragraphs) // n_workers)  # Ceiling division
+        shards = [
+            (start, paragraphs[start:start + shard_size])
+            for start in range(0, len(paragraphs), shard_size)
         ]
         
-        for pattern in patterns:
-            matches = re.findall(pattern, text, re.IGNORECASE)
-            citations.extend(matches)
+        with ProcessPoolExecutor(
+            max_workers=n_workers,
+            mp_context=_POOL_CONTEXT,
+            initializer=_init_worker,
+            initargs=(self.lexicon_file,)
+        ) as executor:
+            shard_rows = list(executor.map(_extract_shard, shards))
         
-        return list(set(citations))  # Remove duplicates
+        return [row for rows in shard_rows for row in rows]
     
-    def extract_from_paragraphs(self, paragraphs: List[str]) -> List[Obligation]:
+    def extract_from_paragraphs(self,
+                                paragraphs: List[str],
+                                n_workers: Optional[int] = None) -> ObligationBatch:
         """
         Extract obligations from a list of paragraphs
         
         Args:
             paragraphs: List of paragraph texts
+            n_workers: Worker processes for inputs over PARALLEL_MIN_PARAGRAPHS
+                (default: serial; the pool rarely pays for itself)
         
         Returns:
-            List of all extracted obligations
+            ObligationBatch of all extracted obligations
         """
-        all_obligations = []
+        rows = None
+        
+        if n_workers and n_workers > 1 and len(paragraphs) > self.PARALLEL_MIN_PARAGRAPHS:
+            try:
+                rows = self._extract_rows_parallel(paragraphs, n_workers)
+            except (BrokenProcessPool, OSError) as e:
+                # The pool itself failed (workers died or could not start);
+                # errors raised by extraction propagate
+                logger.warning(f"Parallel extraction failed, falling back to serial: {e}")
+        
+        if rows is None:
+            rows = self._extract_rows(paragraphs)
         
-        for idx, para in enumerate(paragraphs):
-            section_id = f"para_{idx}"
-            obligations = self.extract_obligations(para, section_id)
-            all_obligations.extend(obligations)
+        all_obligations = ObligationBatch(*zip(*rows))
         
         logger.info(f"Extracted {len(all_obligations)} obligations from {len(paragraphs)} paragraphs")
         return all_obligations
     
-    def get_extraction_stats(self, obligations: List[Obligation]) -> Dict[str, Any]:
+    def get_extraction_stats(self, obligations: Sequence[Obligation]) -> Dict[str, Any]:
         """Get statistics about extracted obligations"""
         if not obligations:
             return {
@@ -265,19 +659,35 @@ class ExtractorAgent:
                 'with_citations': 0
             }
         
+        if not isinstance(obligations, ObligationBatch):
+            obligations = ObligationBatch.from_obligations(obligations)
+        
+        counts = np.bincount(obligations.severities, minlength=len(SEVERITY_NAMES))
+        
         stats = {
             'total': len(obligations),
-            'by_severity': {
-                'high': sum(1 for o in obligations if o.severity == 'high'),
-                'medium': sum(1 for o in obligations if o.severity == 'medium'),
-                'low': sum(1 for o in obligations if o.severity == 'low')
-            },
-            'with_deadlines': sum(1 for o in obligations if o.has_deadline),
-            'with_citations': sum(1 for o in obligations if o.citations)
+            'by_severity': {sev: int(counts[SEVERITY_CODES[sev]]) for sev in ('high', 'medium', 'low')},
+            'with_deadlines': int(obligations.has_deadline.sum()),
+            'with_citations': sum(1 for c in obligations.citations if c)
         }
         
         return stats
 
+# Per-process extractor used by the parallel extraction workers
+_worker_extractor: Optional[ExtractorAgent] = None
+
+
+def _init_worker(lexicon_file: Path):
+    """Build the extractor once per worker process"""
+    global _worker_extractor
+    _worker_extractor = ExtractorAgent(lexicon_file)
+
+
+def _extract_shard(shard: tuple[int, List[str]]) -> List[tuple]:
+    """Extract rows from one (offset, paragraphs) shard"""
+    offset, paragraphs = shard
+    return _worker_extractor._extract_rows(paragraphs, offset)
+
 
 def create_extractor(lexicon_file: Optional[Path] = None) -> ExtractorAgent:
     """Create extractor agent instance"""
@@ -3,15 +3,40 @@ RegDelta Mapper Agent
 Control mapping using local embeddings (SentenceTransformers) + FAISS + fuzzy matching
 """
 
+import os
+import hashlib
 import numpy as np
 import yaml
 from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from collections import Counter
+from functools import lru_cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed parser when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Lightweight model for local CPU inference
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# Mapping statuses, indexed by the codes map_obligations assigns
+MAPPING_STATUSES = ('accepted', 'review', 'rejected')
+
+# Below this many controls an exhaustive flat search is faster than HNSW
+HNSW_MIN_CONTROLS = 1000
+
+# Batches of at least GEMM_MIN_QUERIES against fewer than GEMM_MAX_CONTROLS
+# controls are scored with one matrix product instead of a FAISS search
+GEMM_MIN_QUERIES = 16
+GEMM_MAX_CONTROLS = 5000
+
 
 @dataclass
 class Control:
@@ -22,6 +47,11 @@ class Control:
     description: str
     owner: str
     evidence_examples: List[str]
+    _embed_text: str = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        # Formatted once; used for every embedding and fuzzy comparison
+        self._embed_text = f"{self.title}. {self.description}"
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'Control':
@@ -48,10 +78,10 @@ class Control:
     
     def get_text_for_embedding(self) -> str:
         """Get combined text for embedding"""
-        return f"{self.title}. {self.description}"
+        return self._embed_text
 
 
-@dataclass
+@dataclass(slots=True)
 class ControlMapping:
     """Represents a mapping between obligation and control"""
     obligation_text: str
@@ -79,6 +109,71 @@ class ControlMapping:
         }
 
 
+class OnnxEncoder:
+    """
+    Sentence encoder backed by an ONNX export of the embedding model
+    
+    Drop-in replacement for the SentenceTransformer encode() used by
+    MapperAgent. Point it at a directory produced by
+    `optimum-cli export onnx --model sentence-transformers/all-MiniLM-L6-v2`
+    (optionally followed by `optimum-cli onnxruntime quantize --avx512_vnni`);
+    the int8-quantized model is preferred when present.
+    """
+    
+    MAX_SEQ_LENGTH = 256  # Same truncation as all-MiniLM-L6-v2
+    
+    def __init__(self, model_dir: Path, device: Optional[str] = None):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+        
+        model_dir = Path(model_dir)
+        model_file = model_dir / 'model_quantized.onnx'
+        if not model_file.exists():
+            model_file = model_dir / 'model.onnx'
+        
+        providers = ['CPUExecutionProvider']
+        if device and device.startswith('cuda'):
+            providers.insert(0, 'CUDAExecutionProvider')
+        
+        self.session = ort.InferenceSession(str(model_file), providers=providers)
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir))
+        self.input_names = [inp.name for inp in self.session.get_inputs()]
+        
+        logger.info(f"Loaded ONNX encoder from {model_file}")
+    
+    def encode(self,
+               texts: List[str],
+               batch_size: int = 32,
+               show_progress_bar: bool = False,
+               convert_to_numpy: bool = True,
+               normalize_embeddings: bool = False) -> np.ndarray:
+        """Encode texts into mean-pooled sentence embeddings"""
+        batches = []
+        
+        for start in range(0, len(texts), batch_size):
+            inputs = self.tokenizer(
+                list(texts[start:start + batch_size]),
+                padding=True,
+                truncation=True,
+                max_length=self.MAX_SEQ_LENGTH,
+                return_tensors='np'
+            )
+            feed = {name: inputs[name].astype(np.int64) for name in self.input_names}
+            token_embeddings = self.session.run(None, feed)[0]
+            
+            # Mean pooling over non-padding tokens, as the sentence model does
+            mask = inputs['attention_mask'][..., None].astype(np.float32)
+            summed = (token_embeddings * mask).sum(axis=1)
+            batches.append(summed / np.clip(mask.sum(axis=1), 1e-9, None))
+        
+        embeddings = np.vstack(batches).astype(np.float32)
+        
+        if normalize_embeddings:
+            embeddings /= np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        
+        return embeddings
+
+
 class MapperAgent:
     """Control mapper using local embeddings and fuzzy matching"""
     
@@ -86,10 +181,17 @@ class MapperAgent:
                  catalog_dir: Path,
                  catalog_files: List[str],
                  cosine_weight: float = 0.7,
-                 lexical_weight: float = 0.3):
+                 lexical_weight: float = 0.3,
+                 ef_search: int = 64,
+                 onnx_model: Optional[Path] = None,
+                 device: Optional[str] = None):
         self.catalog_dir = catalog_dir
         self.cosine_weight = cosine_weight
         self.lexical_weight = lexical_weight
+        self.ef_search = ef_search  # HNSW recall/speed trade-off for large catalogs
+        self.onnx_model = Path(onnx_model) if onnx_model else None
+        # e.g. 'cpu' or 'cuda'; None lets the encoder pick (CUDA when available)
+        self.device = device or os.environ.get('REGDELTA_DEVICE') or None
         
         # Load controls from catalogs
         self.controls: List[Control] = []
@@ -99,21 +201,25 @@ class MapperAgent:
         self.model = None
         self.index = None
         self.control_embeddings = None
+        self._control_tokens: List[frozenset] = []
+        self._encode_single = lru_cache(maxsize=4096)(self._encode_one)
         
         logger.info(f"MapperAgent initialized with {len(self.controls)} controls")
     
     def _load_catalogs(self, catalog_files: List[str]):
         """Load control catalogs from YAML files"""
-        for catalog_file in catalog_files:
-            catalog_path = self.catalog_dir / catalog_file
-            
-            if not catalog_path.exists():
-                logger.warning(f"Catalog file not found: {catalog_path}")
+        if not catalog_files:
+            return
+        
+        # Read and parse files concurrently; controls are appended in
+        # catalog order below so the result stays deterministic
+        with ThreadPoolExecutor(max_workers=min(8, len(catalog_files))) as executor:
+            parsed = list(executor.map(self._parse_catalog, catalog_files))
+        
+        for catalog_file, data in zip(catalog_files, parsed):
+            if data is None:
                 continue
             
-            with open(catalog_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
-            
             controls_data = data.get('controls', [])
             for control_data in controls_data:
                 control = Control.from_dict(control_data)
@@ -121,10 +227,27 @@ class MapperAgent:
             
             logger.info(f"Loaded {len(controls_data)} controls from {catalog_file}")
     
+    def _parse_catalog(self, catalog_file: str) -> Optional[Dict[str, Any]]:
+        """Parse one catalog file, or return None if it does not exist"""
+        catalog_path = self.catalog_dir / catalog_file
+        
+        if not catalog_path.exists():
+            logger.warning(f"Catalog file not found: {catalog_path}")
+            return None
+        
+        with open(catalog_path, 'r', encoding='utf-8') as f:
+            return yaml.load(f, Loader=_YamlLoader)
+    
     def build_index(self):
-        """Build FAISS index with control embeddings"""
+        """
+        Build FAISS index with control embeddings
+        
+        Embeddings depend only on the model and the control texts, so the
+        index is cached under catalog_dir/.cache keyed by a hash of both.
+        On a cache hit the SentenceTransformer model is not loaded until a
+        query actually needs encoding.
+        """
         try:
-            from sentence_transformers import SentenceTransformer
             import faiss
         except ImportError as e:
             raise ImportError(
@@ -132,14 +255,39 @@ class MapperAgent:
                 "pip install sentence-transformers faiss-cpu"
             ) from e
         
-        logger.info("Loading SentenceTransformer model (this may take a moment)...")
-        
-        # Use a lightweight model for local CPU inference
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
-        
         # Get control texts for embedding
         control_texts = [ctrl.get_text_for_embedding() for ctrl in self.controls]
         
+        # Control texts never change, so tokenize them once for lexical fallback
+        self._control_tokens = [frozenset(text.lower().split()) for text in control_texts]
+        
+        # Order matters: index positions map back to self.controls
+        encoder_id = f"onnx:{self.onnx_model.resolve()}" if self.onnx_model else EMBEDDING_MODEL
+        hasher = hashlib.sha256(encoder_id.encode('utf-8'))
+        for ctrl, text in zip(self.controls, control_texts):
+            hasher.update(f"\0{ctrl.control_id}\0{text}".encode('utf-8'))
+        cache_key = hasher.hexdigest()
+        
+        cache_dir = self.catalog_dir / '.cache'
+        index_path = cache_dir / f"{cache_key}.faiss"
+        embeddings_path = cache_dir / f"{cache_key}.npy"
+        
+        if index_path.exists():
+            try:
+                self.index = faiss.read_index(str(index_path))
+                # Only exact indexes keep a float32 copy of the embeddings
+                self.control_embeddings = (
+                    np.load(embeddings_path) if embeddings_path.exists() else None
+                )
+                if hasattr(self.index, 'hnsw'):
+                    self.index.hnsw.efSearch = self.ef_search
+                logger.info(f"Loaded FAISS index with {self.index.ntotal} vectors from cache")
+                return
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable embedding cache {index_path}: {e}")
+        
+        self._ensure_model()
+        
         logger.info(f"Encoding {len(control_texts)} control descriptions...")
         self.control_embeddings = self.model.encode(
             control_texts,
@@ -154,10 +302,102 @@ class MapperAgent:
         faiss.normalize_L2(self.control_embeddings)
         
         # Create index
-        self.index = faiss.IndexFlatIP(dimension)  # Inner product = cosine after normalization
+        self.index = self._create_index(faiss, dimension)
+        quantized = not isinstance(self.index, faiss.IndexFlatIP)
+        
+        if not self.index.is_trained:
+            self.index.train(self.control_embeddings)
         self.index.add(self.control_embeddings)
         
         logger.info(f"Built FAISS index with {self.index.ntotal} vectors")
+        
+        if quantized:
+            self._check_quantization_recall(faiss, self.control_embeddings)
+            # The 8-bit codes in the index replace the float32 matrix
+            self.control_embeddings = None
+        
+        try:
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Write-then-rename so a concurrent reader never sees a partial file
+            tmp_suffix = f".{os.getpid()}.tmp"
+            if self.control_embeddings is not None:
+                tmp_embeddings = embeddings_path.with_name(embeddings_path.name + tmp_suffix)
+                with open(tmp_embeddings, 'wb') as f:
+                    np.save(f, self.control_embeddings)
+                os.replace(tmp_embeddings, embeddings_path)
+            tmp_index = index_path.with_name(index_path.name + tmp_suffix)
+            faiss.write_index(self.index, str(tmp_index))
+            os.replace(tmp_index, index_path)
+        except OSError as e:
+            logger.debug(f"Could not write embedding cache {cache_dir}: {e}")
+    
+    def _create_index(self, faiss, dimension: int):
+        """
+        Create an empty inner-product index sized for the catalog
+        
+        Inner product equals cosine similarity on normalized vectors. Large
+        catalogs use HNSW over 8-bit scalar-quantized vectors, which cuts
+        per-vector memory 4x and gives logarithmic search; small ones stay
+        on an exact flat index, which is faster at that size.
+        """
+        if len(self.controls) < HNSW_MIN_CONTROLS:
+            return faiss.IndexFlatIP(dimension)
+        
+        index = faiss.IndexHNSWSQ(
+            dimension, faiss.ScalarQuantizer.QT_8bit, 32, faiss.METRIC_INNER_PRODUCT
+        )
+        index.hnsw.efConstruction = 200
+        index.hnsw.efSearch = self.ef_search
+        return index
+    
+    def _check_quantization_recall(self, faiss, embeddings: np.ndarray, sample_size: int = 100):
+        """
+        Log top-1 agreement between the quantized index and exact search
+        
+        Uses a sample of the control embeddings themselves as queries so
+        quantization loss is visible whenever the index is rebuilt.
+        """
+        exact = faiss.IndexFlatIP(embeddings.shape[1])
+        exact.add(embeddings)
+        
+        step = max(1, len(embeddings) // sample_size)
+        queries = np.ascontiguousarray(embeddings[::step][:sample_size])
+        
+        _, exact_top = exact.search(queries, 1)
+        _, approx_top = self.index.search(queries, 1)
+        agreement = float(np.mean(exact_top[:, 0] == approx_top[:, 0]))
+        
+        if agreement < 0.95:
+            logger.warning(f"Quantized index top-1 agreement with exact search is {agreement:.1%}")
+        else:
+            logger.info(f"Quantized index top-1 agreement with exact search: {agreement:.1%}")
+    
+    def _ensure_model(self):
+        """Load the embedding model on first use"""
+        if self.model is not None:
+            return
+        
+        if self.onnx_model:
+            try:
+                self.model = OnnxEncoder(self.onnx_model, device=self.device)
+            except ImportError as e:
+                raise ImportError(
+                    "Missing dependencies for ONNX encoder. Install with: "
+                    "pip install onnxruntime transformers"
+                ) from e
+            return
+        
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Missing dependencies. Install with: "
+                "pip install sentence-transformers faiss-cpu"
+            ) from e
+        
+        logger.info("Loading SentenceTransformer model (this may take a moment)...")
+        self.model = SentenceTransformer(EMBEDDING_MODEL, device=self.device)
+        logger.info(f"Embedding model running on {self.model.device}")
     
     def _compute_fuzzy_score(self, text1: str, text2: str) -> float:
         """Compute fuzzy token ratio similarity"""
@@ -169,11 +409,80 @@ class MapperAgent:
         
         return fuzz.token_set_ratio(text1, text2) / 100.0
     
+    def _compute_fuzzy_matrix(self,
+                              query_texts: List[str],
+                              indices: np.ndarray,
+                              score_mask: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Compute fuzzy scores between each query and its candidate controls
+        
+        Args:
+            query_texts: Query texts, one per row of indices
+            indices: (n_queries, k) control indices from the FAISS search
+            score_mask: Optional (n_queries, k) mask of pairs worth scoring;
+                defaults to every non-empty slot
+        
+        Returns:
+            (n_queries, k) float32 matrix of lexical scores in [0, 1], with 0
+            for pairs that were not scored
+        """
+        if score_mask is None:
+            score_mask = indices != -1
+        
+        lexical_scores = np.zeros(indices.shape, dtype=np.float32)
+        pair_rows, pair_cols = np.nonzero(score_mask)
+        
+        if not len(pair_rows):
+            return lexical_scores
+        
+        try:
+            from rapidfuzz import process, fuzz
+        except ImportError:
+            logger.warning("rapidfuzz not installed, using simple token overlap")
+            query_tokens = {}
+            
+            for row, col in zip(pair_rows, pair_cols):
+                if row not in query_tokens:
+                    query_tokens[row] = frozenset(query_texts[row].lower().split())
+                lexical_scores[row, col] = self._token_set_overlap(
+                    query_tokens[row], self._control_tokens[indices[row, col]]
+                )
+            
+            return lexical_scores
+        
+        # Score the queries that have work against the union of their
+        # candidates in one C call, then gather the pairs that were asked for
+        query_rows = np.unique(pair_rows)
+        candidates, candidate_pos = np.unique(indices[pair_rows, pair_cols], return_inverse=True)
+        choices = [self.controls[idx].get_text_for_embedding() for idx in candidates]
+        
+        # token_set_ratio only sees the set of whitespace tokens, so dropping
+        # repeated tokens from long obligation texts shrinks the work without
+        # changing any score
+        queries = [' '.join(dict.fromkeys(query_texts[row].split())) for row in query_rows]
+        
+        scores = process.cdist(
+            queries,
+            choices,
+            scorer=fuzz.token_set_ratio,
+            dtype=np.float32,
+            workers=-1
+        ) / 100.0
+        
+        query_pos = np.searchsorted(query_rows, pair_rows)
+        lexical_scores[pair_rows, pair_cols] = scores[query_pos, candidate_pos.ravel()]
+        return lexical_scores
+    
     def _simple_token_overlap(self, text1: str, text2: str) -> float:
         """Simple token overlap fallback if rapidfuzz not available"""
-        tokens1 = set(text1.lower().split())
-        tokens2 = set(text2.lower().split())
-        
+        return self._token_set_overlap(
+            frozenset(text1.lower().split()),
+            frozenset(text2.lower().split())
+        )
+    
+    @staticmethod
+    def _token_set_overlap(tokens1: frozenset, tokens2: frozenset) -> float:
+        """Jaccard overlap of two pre-tokenized texts"""
         if not tokens1 or not tokens2:
             return 0.0
         
@@ -195,46 +504,178 @@ class MapperAgent:
         Returns:
             List of (Control, blended_score, cosine_score, lexical_score)
         """
+        return self._search_batch([query_text], k)[0]
+    
+    def _search_batch(self,
+                      query_texts: List[str],
+                      k: int = 5) -> List[List[Tuple[Control, float, float, float]]]:
+        """
+        Search for matching controls for many queries at once
+        
+        Args:
+            query_texts: Obligation texts to match
+            k: Number of top results to return per query
+        
+        Returns:
+            One list of (Control, blended_score, cosine_score, lexical_score)
+            per query, in input order
+        """
+        all_indices, blended_scores, all_cosine_scores, lexical_scores = (
+            self._search_matrices(query_texts, k)
+        )
+        
+        batch_results = []
+        
+        for indices, blended_row, cosine_row, lexical_row in zip(
+            all_indices, blended_scores, all_cosine_scores, lexical_scores
+        ):
+            batch_results.append([
+                (self.controls[idx], blended_score, cosine_score, lexical_score)
+                for idx, blended_score, cosine_score, lexical_score in zip(
+                    indices, blended_row, cosine_row, lexical_row
+                )
+                if idx != -1  # FAISS returns -1 for empty results
+            ])
+        
+        return batch_results
+    
+    def _search_matrices(self,
+                         query_texts: List[str],
+                         k: int = 5,
+                         min_score: Optional[float] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Score the top-k controls for many queries as (n_queries, k) matrices
+        
+        All queries are encoded in one model call and searched with one
+        FAISS call. Each row is sorted by blended score, best first; control
+        indices of -1 mark empty FAISS slots.
+        
+        Args:
+            query_texts: Obligation texts to match
+            k: Number of top results to return per query
+            min_score: If given, hits whose cosine score is too low to reach
+                it even with a perfect lexical score skip fuzzy scoring and
+                are dropped, leaving -1 slots at the end of their row
+        
+        Returns:
+            (control_indices, blended_scores, cosine_scores, lexical_scores)
+        """
         if self.index is None:
             raise RuntimeError("Index not built. Call build_index() first.")
         
-        # Encode query
-        query_embedding = self.model.encode([query_text], convert_to_numpy=True)
+        if not query_texts:
+            empty = np.empty((0, k), dtype=np.float32)
+            return np.empty((0, k), dtype=np.int64), empty, empty, empty
         
-        # Normalize for cosine similarity
-        import faiss
-        faiss.normalize_L2(query_embedding)
+        # Repeated boilerplate is scored once and scattered back afterwards
+        unique_positions = {}
+        inverse = np.array(
+            [unique_positions.setdefault(text, len(unique_positions)) for text in query_texts],
+            dtype=np.intp
+        )
+        unique_texts = list(unique_positions)
         
-        # Search FAISS index
-        cosine_scores, indices = self.index.search(query_embedding, k)
-        cosine_scores = cosine_scores[0]  # Unpack batch dimension
-        indices = indices[0]
+        query_embeddings = self._encode_queries(unique_texts)
         
-        # Compute blended scores
-        results = []
+        # Search index, shape (n_unique, k)
+        all_cosine_scores, all_indices = self._search_index(query_embeddings, k)
         
-        for idx, cosine_score in zip(indices, cosine_scores):
-            if idx == -1:  # FAISS returns -1 for empty results
-                continue
-            
-            control = self.controls[idx]
-            control_text = control.get_text_for_embedding()
-            
-            # Compute lexical similarity
-            lexical_score = self._compute_fuzzy_score(query_text, control_text)
-            
-            # Blend scores
-            blended_score = (
-                self.cosine_weight * cosine_score + 
-                self.lexical_weight * lexical_score
-            )
-            
-            results.append((control, blended_score, cosine_score, lexical_score))
+        score_mask = all_indices != -1
+        
+        if min_score is not None and self.cosine_weight > 0:
+            cosine_cutoff = (min_score - self.lexical_weight * 1.0) / self.cosine_weight
+            score_mask &= all_cosine_scores >= cosine_cutoff
+        
+        # Lexical similarity for every remaining (query, candidate) pair at once
+        lexical_scores = self._compute_fuzzy_matrix(unique_texts, all_indices, score_mask)
+        
+        # Blend scores
+        blended_scores = (
+            self.cosine_weight * all_cosine_scores + 
+            self.lexical_weight * lexical_scores
+        )
+        
+        # Unscored hits have no real lexical score, so they are reported as
+        # empty slots rather than with a made-up one
+        all_indices = np.where(score_mask, all_indices, -1)
+        blended_scores = np.where(score_mask, blended_scores, -np.inf).astype(np.float32)
         
-        # Sort by blended score
-        results.sort(key=lambda x: x[1], reverse=True)
+        # Sort every row by blended score at once; stable to keep FAISS order on ties
+        order = np.argsort(-blended_scores, axis=1, kind='stable')
         
-        return results
+        return (
+            np.take_along_axis(all_indices, order, axis=1)[inverse],
+            np.take_along_axis(blended_scores, order, axis=1)[inverse],
+            np.take_along_axis(all_cosine_scores, order, axis=1)[inverse],
+            np.take_along_axis(lexical_scores, order, axis=1)[inverse]
+        )
+    
+    def _encode_queries(self, query_texts: List[str]) -> np.ndarray:
+        """Encode and normalize query texts for cosine similarity"""
+        self._ensure_model()
+        
+        if len(query_texts) == 1:
+            # Single-shot search_controls calls often repeat the same query
+            return self._encode_single(query_texts[0])[None, :]
+        
+        return self.model.encode(
+            query_texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+    
+    def _encode_one(self, query_text: str) -> np.ndarray:
+        """Encode a single normalized query embedding (cached per instance)"""
+        embedding = self.model.encode(
+            [query_text],
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )[0]
+        embedding.flags.writeable = False  # Shared by every cache hit
+        return embedding
+    
+    def _search_index(self, query_embeddings: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Find the k most similar controls for each normalized query embedding
+        
+        For a batch of queries against a small catalog a single BLAS GEMM
+        over the cached embeddings beats per-query FAISS dispatch; larger
+        catalogs, small batches and quantized indexes go through FAISS.
+        
+        Returns:
+            (cosine_scores, indices), both (n_queries, k) and best first,
+            padded with -1 indices like FAISS when k exceeds the catalog
+        """
+        n_controls = len(self.controls)
+        
+        if (self.control_embeddings is None
+                or n_controls >= GEMM_MAX_CONTROLS
+                or len(query_embeddings) < GEMM_MIN_QUERIES):
+            return self.index.search(query_embeddings, k)
+        
+        scores = query_embeddings @ self.control_embeddings.T
+        top_k = min(k, n_controls)
+        
+        if top_k < n_controls:
+            top = np.argpartition(-scores, top_k - 1, axis=1)[:, :top_k]
+        else:
+            top = np.broadcast_to(np.arange(n_controls), scores.shape)
+        
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        cosine_scores = np.take_along_axis(top_scores, order, axis=1)
+        indices = np.take_along_axis(top, order, axis=1).astype(np.int64)
+        
+        if top_k < k:
+            n_missing = k - top_k
+            cosine_scores = np.pad(
+                cosine_scores, ((0, 0), (0, n_missing)),
+                constant_values=-np.finfo(np.float32).max
+            )
+            indices = np.pad(indices, ((0, 0), (0, n_missing)), constant_values=-1)
+        
+        return cosine_scores, indices
     
     def map_obligations(self,
                        obligations: List[Any],
@@ -255,31 +696,39 @@ class MapperAgent:
         """
         mappings = {}
         
-        for obligation in obligations:
-            search_results = self.search_controls(obligation.text, k=k)
-            
-            obligation_mappings = []
-            
-            for control, blended_score, cosine_score, lexical_score in search_results:
-                # Determine initial status based on threshold
-                if blended_score >= threshold_high:
-                    status = 'accepted'
-                elif blended_score >= threshold_low:
-                    status = 'review'
-                else:
-                    status = 'rejected'
-                
-                mapping = ControlMapping(
+        obligations = list(obligations)
+        # Hits that cannot reach threshold_low are dropped without fuzzy scoring
+        all_indices, blended_scores, cosine_scores, lexical_scores = self._search_matrices(
+            [ob.text for ob in obligations], k=k, min_score=threshold_low
+        )
+        
+        # Determine initial status for every candidate based on thresholds
+        status_codes = np.where(
+            blended_scores >= threshold_high, 0,
+            np.where(blended_scores >= threshold_low, 1, 2)
+        )
+        statuses = np.array(MAPPING_STATUSES)[status_codes].tolist()
+        
+        control_ids = [ctrl.control_id for ctrl in self.controls]
+        control_titles = [ctrl.title for ctrl in self.controls]
+        
+        for row, obligation in enumerate(obligations):
+            obligation_mappings = [
+                ControlMapping(
                     obligation_text=obligation.text,
-                    control_id=control.control_id,
-                    control_title=control.title,
+                    control_id=control_ids[idx],
+                    control_title=control_titles[idx],
                     score=blended_score,
                     cosine_score=cosine_score,
                     lexical_score=lexical_score,
                     status=status
                 )
-                
-                obligation_mappings.append(mapping)
+                for idx, blended_score, cosine_score, lexical_score, status in zip(
+                    all_indices[row], blended_scores[row], cosine_scores[row],
+                    lexical_scores[row], statuses[row]
+                )
+                if idx != -1  # FAISS returns -1 for empty results
+            ]
             
             mappings[obligation.section_id] = obligation_mappings
             
@@ -302,15 +751,22 @@ class MapperAgent:
                 'avg_score': 0.0
             }
         
+        # Single pass over all mappings
+        status_counts = Counter()
+        score_sum = 0.0
+        top_score = float('-inf')
+        
+        for m in all_mappings:
+            status_counts[m.status] += 1
+            score_sum += float(m.score)
+            if m.score > top_score:
+                top_score = m.score
+        
         stats = {
             'total_mappings': len(all_mappings),
-            'by_status': {
-                'accepted': sum(1 for m in all_mappings if m.status == 'accepted'),
-                'review': sum(1 for m in all_mappings if m.status == 'review'),
-                'rejected': sum(1 for m in all_mappings if m.status == 'rejected')
-            },
-            'avg_score': sum(m.score for m in all_mappings) / len(all_mappings),
-            'top_score': max(m.score for m in all_mappings),
+            'by_status': {status: status_counts[status] for status in MAPPING_STATUSES},
+            'avg_score': score_sum / len(all_mappings),
+            'top_score': top_score,
             'obligations_with_mappings': len(mappings)
         }
         
@@ -320,6 +776,11 @@ class MapperAgent:
 def create_mapper(catalog_dir: Path,
                  catalog_files: List[str],
                  cosine_weight: float = 0.7,
-                 lexical_weight: float = 0.3) -> MapperAgent:
+                 lexical_weight: float = 0.3,
+                 ef_search: int = 64,
+                 onnx_model: Optional[Path] = None,
+                 device: Optional[str] = None) -> MapperAgent:
     """Create mapper agent instance"""
-    return MapperAgent(catalog_dir, catalog_files, cosine_weight, lexical_weight)
+    return MapperAgent(
+        catalog_dir, catalog_files, cosine_weight, lexical_weight, ef_search, onnx_model, device
+    )
@@ -6,7 +6,8 @@ Orchestrates the workflow: ingest → diff → extract → map → plan
 import json
 from pathlib import Path
 from typing import Dict, Any, Optional, List
-from datetime import datetime
+from datetime import datetime, timezone
+import time
 import logging
 
 from utils.config import Config
@@ -50,18 +51,23 @@ def convert_to_serializable(obj):
             return obj
 
 
-class NumpyEncoder(json.JSONEncoder):
-    """Custom JSON encoder to handle numpy types"""
-    def default(self, obj):
-        try:
-            import numpy as np
-            if isinstance(obj, (np.integer, np.floating)):
-                return float(obj)
-            elif isinstance(obj, np.ndarray):
-                return obj.tolist()
-        except ImportError:
-            pass
-        return super().default(obj)
+def _write_json(path: Path, data: Any):
+    """
+    Write data to path as indented JSON
+    
+    Uses orjson when available, which serializes numpy scalars and arrays
+    natively in C; otherwise converts numpy types and uses the json module.
+    """
+    try:
+        import orjson
+    except ImportError:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(convert_to_serializable(data), f, indent=2)
+        return
+    
+    path.write_bytes(
+        orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+    )
 
 
 class PlannerAgent:
@@ -102,7 +108,9 @@ class PlannerAgent:
             catalog_dir=self.config.catalog_dir,
             catalog_files=self.config.catalogs,
             cosine_weight=self.config.blend_weights['cosine'],
-            lexical_weight=self.config.blend_weights['lexical']
+            lexical_weight=self.config.blend_weights['lexical'],
+            onnx_model=self.config.get('mapping.onnx_model'),
+            device=self.config.get('mapping.device')
         )
         
         self.audit.log(
@@ -143,6 +151,7 @@ class PlannerAgent:
             Ingestion summary
         """
         self.current_scenario = scenario_name
+        ingested_at = datetime.now(timezone.utc).isoformat()
         
         logger.info(f"Stage 1: Ingesting documents for scenario '{scenario_name}'")
         
@@ -159,12 +168,14 @@ class PlannerAgent:
                 text, extractor = extract_text(baseline_pdf, self.config.skip_on_error)
                 paragraphs = paragraphize(text)
                 
+                # Documents are kept as their paragraph list only: it is
+                # computed once here and shared by the diff and extract
+                # stages, and the raw text is not held alongside it
                 self.baseline_doc = {
                     'path': str(baseline_pdf),
-                    'text': text,
                     'paragraphs': paragraphs,
                     'extractor': extractor,
-                    'ingested_at': datetime.utcnow().isoformat()
+                    'ingested_at': ingested_at
                 }
                 
                 summary['baseline'] = {
@@ -192,10 +203,9 @@ class PlannerAgent:
                 
                 self.new_doc = {
                     'path': str(new_pdf),
-                    'text': text,
                     'paragraphs': paragraphs,
                     'extractor': extractor,
-                    'ingested_at': datetime.utcnow().isoformat()
+                    'ingested_at': ingested_at
                 }
                 
                 summary['new'] = {
@@ -231,10 +241,10 @@ class PlannerAgent:
             logger.warning("Cannot diff: missing baseline or new document")
             return {'error': 'Missing documents'}
         
-        baseline_paras = self.baseline_doc['paragraphs']
-        new_paras = self.new_doc['paragraphs']
-        
-        self.diff_result = diff(baseline_paras, new_paras)
+        self.diff_result = diff(
+            self.baseline_doc['paragraphs'],
+            self.new_doc['paragraphs']
+        )
         summary = self.diff_result.get_summary()
         
         self.audit.log(
@@ -327,7 +337,8 @@ class PlannerAgent:
         logger.info(f"Running full pipeline for scenario: {scenario_name}")
         logger.info("=" * 60)
         
-        pipeline_start = datetime.utcnow()
+        pipeline_start = datetime.now(timezone.utc)
+        start_time = time.perf_counter()
         
         results = {
             'scenario': scenario_name,
@@ -359,10 +370,9 @@ class PlannerAgent:
             results['stages']['map'] = self.stage_map()
             
             # Calculate duration
-            pipeline_end = datetime.utcnow()
-            duration = (pipeline_end - pipeline_start).total_seconds()
+            duration = time.perf_counter() - start_time
             
-            results['completed_at'] = pipeline_end.isoformat()
+            results['completed_at'] = datetime.now(timezone.utc).isoformat()
             results['duration_seconds'] = duration
             results['status'] = 'success'
             
@@ -373,7 +383,8 @@ class PlannerAgent:
             self.audit.log(
                 actor="planner",
                 action="pipeline_complete",
-                payload={'duration': duration, 'scenario': scenario_name}
+                payload={'duration': duration, 'scenario': scenario_name},
+                durable=True  # Sync the whole run to disk before returning
             )
             
         except Exception as e:
@@ -384,7 +395,8 @@ class PlannerAgent:
             self.audit.log(
                 actor="planner",
                 action="pipeline_failed",
-                payload={'error': str(e), 'scenario': scenario_name}
+                payload={'error': str(e), 'scenario': scenario_name},
+                durable=True  # Sync the whole run to disk before returning
             )
         
         return results
@@ -397,10 +409,8 @@ class PlannerAgent:
         if self.obligations:
             try:
                 obligations_file = output_dir / f"{self.current_scenario}_obligations.json"
-                with open(obligations_file, 'w', encoding='utf-8') as f:
-                    obligations_data = [ob.to_dict() for ob in self.obligations]
-                    obligations_data = convert_to_serializable(obligations_data)
-                    json.dump(obligations_data, f, indent=2)
+                obligations_data = [ob.to_dict() for ob in self.obligations]
+                _write_json(obligations_file, obligations_data)
                 logger.info(f"Saved obligations to {obligations_file}")
             except Exception as e:
                 logger.error(f"Failed to save obligations: {e}")
@@ -414,9 +424,7 @@ class PlannerAgent:
                     section_id: [m.to_dict() for m in maps]
                     for section_id, maps in self.mappings.items()
                 }
-                mappings_data = convert_to_serializable(mappings_data)
-                with open(mappings_file, 'w', encoding='utf-8') as f:
-                    json.dump(mappings_data, f, indent=2)
+                _write_json(mappings_file, mappings_data)
                 logger.info(f"Saved mappings to {mappings_file}")
             except Exception as e:
                 logger.error(f"Failed to save mappings: {e}")
@@ -426,9 +434,7 @@ class PlannerAgent:
         if self.diff_result:
             try:
                 diff_file = output_dir / f"{self.current_scenario}_diff.json"
-                diff_data = convert_to_serializable(self.diff_result.to_dict())
-                with open(diff_file, 'w', encoding='utf-8') as f:
-                    json.dump(diff_data, f, indent=2)
+                _write_json(diff_file, self.diff_result.to_dict())
                 logger.info(f"Saved diff to {diff_file}")
             except Exception as e:
                 logger.error(f"Failed to save diff: {e}")
@@ -3,25 +3,92 @@ RegDelta System Check
 Verify installation and dependencies
 """
 
+import os
 import sys
+import importlib
+import importlib.util
 from pathlib import Path
 
+# Modules whose native libraries can be present but fail to load, so a
+# presence check is not enough and they are actually imported
+VERIFY_BY_IMPORT = {'faiss'}
+
+# Project modules and the entry point each must provide, in dependency order
+CRITICAL_IMPORTS = [
+    ('utils.config', 'get_config'),
+    ('utils.audit', 'get_audit_logger'),
+    ('agents.extractor', 'ExtractorAgent'),
+    ('agents.mapper', 'MapperAgent'),
+    ('agents.planner', 'PlannerAgent'),
+]
+
+
+def is_module_available(module: str) -> bool:
+    """
+    Check whether a module can be imported
+    
+    Uses importlib.util.find_spec so heavy packages (sentence_transformers
+    pulls in torch) are located without running their init code.
+    """
+    if module in VERIFY_BY_IMPORT:
+        # A broken native library can kill the process outright; show the
+        # report up to this point first
+        flush_report()
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            return False
+    
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
+
+
+# Report lines queued since the last flush_report()
+_out = []
+
+
+def emit(line: str = "") -> None:
+    """Queue a line of the report"""
+    _out.append(line)
+
+
+def flush_report() -> None:
+    """Write the queued report lines to stdout in one call"""
+    if not _out:
+        return
+    
+    sys.stdout.write('\n'.join(_out) + '\n')
+    sys.stdout.flush()
+    _out.clear()
+
+
+def list_dir(path: str) -> set:
+    """List the entry names of a directory in one scandir pass"""
+    try:
+        with os.scandir(path) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
+
 
 def check_python_version():
     """Check Python version"""
-    print("Checking Python version...")
+    emit("Checking Python version...")
     version = sys.version_info
     if version >= (3, 10):
-        print(f"✓ Python {version.major}.{version.minor}.{version.micro}")
+        emit(f"✓ Python {version.major}.{version.minor}.{version.micro}")
         return True
     else:
-        print(f"✗ Python {version.major}.{version.minor}.{version.micro} (requires 3.10+)")
+        emit(f"✗ Python {version.major}.{version.minor}.{version.micro} (requires 3.10+)")
         return False
 
 
 def check_dependencies():
     """Check required packages"""
-    print("\nChecking dependencies...")
+    emit("\nChecking dependencies...")
     
     required = {
         'yaml': 'pyyaml',
@@ -42,27 +109,25 @@ def check_dependencies():
     
     # Check required
     for module, package in required.items():
-        try:
-            __import__(module)
-            print(f"✓ {package}")
-        except ImportError:
-            print(f"✗ {package} (REQUIRED)")
+        if is_module_available(module):
+            emit(f"✓ {package}")
+        else:
+            emit(f"✗ {package} (REQUIRED)")
             all_ok = False
     
     # Check optional
     pdf_extractors = []
     for module, package in optional.items():
-        try:
-            __import__(module)
-            print(f"✓ {package}")
+        if is_module_available(module):
+            emit(f"✓ {package}")
             pdf_extractors.append(package)
-        except ImportError:
-            print(f"⚠ {package} (optional)")
+        else:
+            emit(f"⚠ {package} (optional)")
     
     if not pdf_extractors:
-        print("\n⚠ WARNING: No PDF extractors available. Install at least one:")
-        print("  pip install PyMuPDF")
-        print("  pip install pdfplumber")
+        emit("\n⚠ WARNING: No PDF extractors available. Install at least one:")
+        emit("  pip install PyMuPDF")
+        emit("  pip install pdfplumber")
         all_ok = False
     
     return all_ok
@@ -70,7 +135,7 @@ def check_dependencies():
 
 def check_files():
     """Check required files exist"""
-    print("\nChecking configuration files...")
+    emit("\nChecking configuration files...")
     
     required_files = [
         'config.yml',
@@ -81,12 +146,18 @@ def check_files():
     
     all_ok = True
     
+    # One directory listing per parent instead of a stat() per file
+    listings = {}
     for file in required_files:
-        path = Path(file)
-        if path.exists():
-            print(f"✓ {file}")
+        parent, _, name = file.rpartition('/')
+        parent = parent or '.'
+        if parent not in listings:
+            listings[parent] = list_dir(parent)
+        
+        if name in listings[parent]:
+            emit(f"✓ {file}")
         else:
-            print(f"✗ {file} (MISSING)")
+            emit(f"✗ {file} (MISSING)")
             all_ok = False
     
     return all_ok
@@ -94,7 +165,7 @@ def check_files():
 
 def check_directories():
     """Check/create required directories"""
-    print("\nChecking directories...")
+    emit("\nChecking directories...")
     
     required_dirs = [
         'data',
@@ -103,96 +174,113 @@ def check_directories():
         'scenarios'
     ]
     
+    present = list_dir('.')
+    all_ok = True
+    
     for dir_name in required_dirs:
-        path = Path(dir_name)
-        if path.exists():
-            print(f"✓ {dir_name}/")
+        try:
+            os.makedirs(dir_name, exist_ok=True)
+        except FileExistsError:
+            emit(f"✗ {dir_name}/ (not a directory)")
+            all_ok = False
+            continue
+        except OSError as e:
+            emit(f"✗ {dir_name}/ ({e.strerror})")
+            all_ok = False
+            continue
+        
+        if dir_name in present:
+            emit(f"✓ {dir_name}/")
         else:
-            path.mkdir(parents=True, exist_ok=True)
-            print(f"✓ {dir_name}/ (created)")
+            emit(f"✓ {dir_name}/ (created)")
     
-    return True
+    return all_ok
 
 
 def test_imports():
     """Test critical imports"""
-    print("\nTesting critical imports...")
+    emit("\nTesting critical imports...")
     
     # Add project root to Python path
-    project_root = Path(__file__).parent
+    project_root = Path(__file__).resolve().parent
     if str(project_root) not in sys.path:
         sys.path.insert(0, str(project_root))
     
-    try:
-        from utils.config import get_config
-        print("✓ utils.config")
-    except Exception as e:
-        print(f"✗ utils.config: {e}")
-        return False
-    
-    try:
-        from utils.audit import get_audit_logger
-        print("✓ utils.audit")
-    except Exception as e:
-        print(f"✗ utils.audit: {e}")
-        return False
-    
-    try:
-        from agents.extractor import ExtractorAgent
-        print("✓ agents.extractor")
-    except Exception as e:
-        print(f"✗ agents.extractor: {e}")
-        return False
-    
-    try:
-        from agents.mapper import MapperAgent
-        print("✓ agents.mapper")
-    except Exception as e:
-        print(f"✗ agents.mapper: {e}")
-        return False
-    
-    try:
-        from agents.planner import PlannerAgent
-        print("✓ agents.planner")
-    except Exception as e:
-        print(f"✗ agents.planner: {e}")
-        return False
+    for module, name in CRITICAL_IMPORTS:
+        try:
+            # Locate the module first so a missing one is reported without
+            # leaving a half-initialized import behind in sys.modules
+            if importlib.util.find_spec(module) is None:
+                emit(f"✗ {module}: module not found")
+                return False
+            flush_report()  # Agent imports load the native model stack
+            getattr(importlib.import_module(module), name)
+            emit(f"✓ {module}")
+        except Exception as e:
+            emit(f"✗ {module}: {e}")
+            return False
     
     return True
 
 
 def main():
-    print("=" * 60)
-    print("RegDelta System Check")
-    print("=" * 60)
+    # Emit what is left of the report even if a check raises
+    try:
+        return run_checks()
+    finally:
+        flush_report()
+
+
+def run_section(check) -> bool:
+    """Run one check section, then write its part of the report"""
+    try:
+        return check()
+    finally:
+        flush_report()
+
+
+def run_checks():
+    """Run all checks, writing the report a section at a time, and return the exit code"""
+    emit("=" * 60)
+    emit("RegDelta System Check")
+    emit("=" * 60)
     
     checks = {
-        'Python Version': check_python_version(),
-        'Dependencies': check_dependencies(),
-        'Configuration Files': check_files(),
-        'Directories': check_directories(),
-        'Module Imports': test_imports()
+        'Python Version': run_section(check_python_version),
+        'Dependencies': run_section(check_dependencies),
+        'Configuration Files': run_section(check_files),
+        'Directories': run_section(check_directories)
     }
     
-    print("\n" + "=" * 60)
-    print("SUMMARY")
-    print("=" * 60)
+    # Importing the agents loads the whole model stack, so only try it
+    # once the dependencies and config files are known to be in place
+    if checks['Dependencies'] and checks['Configuration Files']:
+        checks['Module Imports'] = run_section(test_imports)
+    else:
+        emit("\nTesting critical imports...")
+        emit("⚠ Skipped (fix dependencies and configuration files first)")
+        checks['Module Imports'] = False
+        flush_report()
+    
+    emit("\n" + "=" * 60)
+    emit("SUMMARY")
+    emit("=" * 60)
     
     for name, result in checks.items():
         status = "✓ PASS" if result else "✗ FAIL"
-        print(f"{name}: {status}")
+        emit(f"{name}: {status}")
     
     if all(checks.values()):
-        print("\n✓ All checks passed! RegDelta is ready to use.")
-        print("\nNext steps:")
-        print("  1. Run UI: streamlit run ui/app.py")
-        print("  2. Or CLI: python run.py --new your-pdf.pdf")
-        print("  3. See QUICKSTART.md for more info")
+        emit("\n✓ All checks passed! RegDelta is ready to use.")
+        emit("\nNext steps:")
+        emit("  1. Run UI: streamlit run ui/app.py")
+        emit("  2. Or CLI: python run.py --new your-pdf.pdf")
+        emit("  3. See QUICKSTART.md for more info")
         return 0
     else:
-        print("\n✗ Some checks failed. Please fix the issues above.")
-        print("\nTo install missing dependencies:")
-        print("  pip install -r requirements.txt")
+        emit("\n✗ Some checks failed. Please fix the issues above.")
+        emit("\nTo install missing dependencies:")
+        emit("  pip install -r requirements.txt")
         return 1
 
 
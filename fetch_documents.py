@@ -3,19 +3,30 @@ RegDelta Document Fetcher
 Downloads regulatory documents from configured URLs
 """
 
+import os
 import sys
+import argparse
+import json
+import hashlib
+import pickle
+import shutil
+import threading
 from pathlib import Path
 
 # Add project root to Python path
-project_root = Path(__file__).parent
+project_root = Path(__file__).resolve().parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 import yaml
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from urllib.parse import urlparse
 import logging
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional
 
 logging.basicConfig(
     level=logging.INFO,
@@ -23,69 +34,454 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed parser when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+# Maximum concurrent downloads per scenario
+DOWNLOAD_WORKERS = 8
+
+# Read size for streamed downloads; PDFs are several MB, so large chunks
+# keep the Python loop and write() calls to a handful per file
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
+# Bytes written between resume checkpoints; each checkpoint flushes the file
+# and rewrites the .meta sidecar, so it is kept well above a single chunk
+PROGRESS_CHECKPOINT_SIZE = 4 * DOWNLOAD_CHUNK_SIZE
+
+
+def _create_session() -> requests.Session:
+    """Create an HTTP session with keep-alive connection pooling and retries"""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=16,
+        pool_maxsize=16,
+        max_retries=Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=(429, 500, 502, 503, 504)
+        )
+    )
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+# Shared by all download threads so connections to the same host are reused
+_SESSION = _create_session()
+
+
+# Parsed fetch configs, reused across runs while the YAML is unchanged
+CONFIG_CACHE_FILE = (
+    Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+    / 'regdelta' / 'fetch_config.pkl'
+)
+
 
 def load_fetch_config(config_file: Path) -> Dict:
-    """Load fetch configuration from YAML"""
-    if not config_file.exists():
-        raise FileNotFoundError(f"Fetch config not found: {config_file}")
+    """
+    Load fetch configuration from YAML
+    
+    The parsed result is pickled under CONFIG_CACHE_FILE, keyed on the
+    config's path, mtime and size, so unchanged configs skip the YAML parser.
+    """
+    try:
+        st = config_file.stat()
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Fetch config not found: {config_file}") from None
+    
+    key = (str(config_file.resolve()), st.st_mtime_ns, st.st_size)
+    
+    try:
+        with open(CONFIG_CACHE_FILE, 'rb') as f:
+            cached_key, config = pickle.load(f)
+        if cached_key == key:
+            return config
+    except Exception:
+        # Missing, stale-format or corrupt cache; fall through to parse
+        pass
     
     with open(config_file, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f)
+        config = yaml.load(f, Loader=_YamlLoader)
+    
+    try:
+        CONFIG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = CONFIG_CACHE_FILE.with_name(f"{CONFIG_CACHE_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp_file, 'wb') as f:
+            pickle.dump((key, config), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file, CONFIG_CACHE_FILE)
+    except OSError as e:
+        logger.debug("Could not write config cache: %s", e)
+    
+    return config
+
+
+class FetchCache:
+    """
+    HTTP validators (ETag / Last-Modified) for downloaded URLs
+    
+    Persisted as JSON so later runs can revalidate existing files with a
+    conditional GET instead of skipping them blindly or re-downloading.
+    Safe to share between download threads.
+    """
+    
+    def __init__(self, cache_file: Path):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                self.entries: Dict[str, Dict] = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+    
+    def get(self, url: str) -> Optional[Dict]:
+        """Get the cached validators for a URL"""
+        with self._lock:
+            return self.entries.get(url)
+    
+    def update(self, url: str, entry: Dict):
+        """Record validators for a URL"""
+        with self._lock:
+            self.entries[url] = entry
+    
+    def save(self):
+        """Write the cache to disk atomically"""
+        with self._lock:
+            data = json.dumps(self.entries, indent=2)
+        
+        try:
+            tmp_file = self.cache_file.with_name(f"{self.cache_file.name}.{os.getpid()}.tmp")
+            tmp_file.write_text(data, encoding='utf-8')
+            os.replace(tmp_file, self.cache_file)
+        except OSError as e:
+            logger.warning("Could not write fetch cache %s: %s", self.cache_file, e)
+
+
+class SourceRegistry:
+    """
+    Tracks which URL each download is responsible for
+    
+    The first caller to claim a URL downloads it; everyone else waits for
+    the result and links to that copy. Safe to share between scenarios
+    fetched concurrently.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._done: Dict[str, threading.Event] = {}
+        self._paths: Dict[str, Optional[Path]] = {}
+    
+    def claim(self, url: str) -> bool:
+        """Claim a URL; True means the caller must download and publish it"""
+        with self._lock:
+            if url in self._done:
+                return False
+            self._done[url] = threading.Event()
+            return True
+    
+    def publish(self, url: str, path: Optional[Path]):
+        """Record the fetched path for a claimed URL (None if it failed)"""
+        self._paths[url] = path
+        self._done[url].set()
+    
+    def wait(self, url: str) -> Optional[Path]:
+        """Block until a claimed URL is published and return its path"""
+        with self._lock:
+            done = self._done[url]
+        done.wait()
+        return self._paths[url]
+
 
+def _file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's contents"""
+    with open(path, 'rb') as f:
+        if hasattr(hashlib, 'file_digest'):
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        digest = hashlib.sha256()
+        for block in iter(lambda: f.read(DOWNLOAD_CHUNK_SIZE), b''):
+            digest.update(block)
+        return digest.hexdigest()
 
-def download_file(url: str, output_path: Path) -> bool:
+
+def download_file(url: str,
+                  output_path: Path,
+                  cache: Optional[FetchCache] = None,
+                  sha256: Optional[str] = None) -> bool:
     """
     Download a file from URL to output path
     
     Args:
         url: URL to download from
-        output_path: Path to save the file
+        output_path: Path to save the file (its directory must exist)
+        cache: Optional validator cache; an existing file is only
+            re-downloaded if the server reports it changed
+        sha256: Optional expected hex digest; a mismatching download is
+            discarded
     
     Returns:
-        True if successful, False otherwise
+        True if successful (or unchanged), False otherwise
+    """
+    return _download(url, output_path, cache, sha256) != 'failed'
+
+
+def _download(url: str,
+              output_path: Path,
+              cache: Optional[FetchCache] = None,
+              sha256: Optional[str] = None) -> str:
+    """
+    Download a file, returning 'downloaded', 'unchanged' or 'failed'
+    
+    Bytes are streamed into a sibling ".part" file that is renamed into
+    place on success. A ".part.json" sidecar records the partial
+    response's validator and how many bytes have been written, so a later
+    attempt resumes from there with an HTTP Range request conditional on
+    If-Range. The SHA-256 is computed while streaming, checked against
+    sha256 if given, and recorded in the cache.
     """
+    expected = sha256.lower() if sha256 else None
+    part_path = output_path.with_name(output_path.name + '.part')
+    meta_path = output_path.with_name(output_path.name + '.part.json')
+    cached = cache.get(url) if cache else None
+    
     try:
-        logger.info(f"Downloading: {url}")
+        partial = _read_partial_meta(meta_path, url) if part_path.exists() else None
+        
+        # Resume only from bytes known to be written (the file itself may
+        # be longer from preallocation) and only with a validator for
+        # If-Range; otherwise the partial file is not trusted
+        validator = partial and (partial.get('etag') or partial.get('last_modified'))
+        if validator and validator.startswith('W/'):
+            validator = partial.get('last_modified')  # If-Range needs a strong ETag
+        offset = min(partial['written'], part_path.stat().st_size) if validator else 0
+        headers = {}
         
-        # Create output directory
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        if cached and output_path.exists() and output_path.stat().st_size == cached.get('size'):
+            # Conditional GET: a 304 transfers no body
+            if cached.get('etag'):
+                headers['If-None-Match'] = cached['etag']
+            if cached.get('last_modified'):
+                headers['If-Modified-Since'] = cached['last_modified']
+            logger.info("Revalidating: %s", url)
+        elif offset:
+            headers['Range'] = f"bytes={offset}-"
+            # Only resume if the remote file is still the one we started on;
+            # otherwise the server sends the whole file with a 200
+            headers['If-Range'] = validator
+            logger.info("Resuming at byte %d: %s", offset, url)
+        else:
+            logger.info("Downloading: %s", url)
         
         # Download with streaming
-        response = requests.get(url, stream=True, timeout=60)
+        response = _SESSION.get(url, stream=True, timeout=60, headers=headers)
+        
+        if response.status_code == 304:
+            response.close()
+            if expected:
+                actual = cached.get('sha256') or _file_sha256(output_path)
+                if actual != expected:
+                    logger.error("✗ Checksum mismatch for %s: expected %s, got %s",
+                                 output_path.name, expected, actual)
+                    return 'failed'
+            logger.info("✓ Unchanged: %s", output_path.name)
+            return 'unchanged'
+        
+        if response.status_code == 416:
+            # Partial file is unusable for this resource; start over
+            response.close()
+            part_path.unlink()
+            meta_path.unlink(missing_ok=True)
+            response = _SESSION.get(url, stream=True, timeout=60)
+        
         response.raise_for_status()
         
+        # 206 continues the partial file; a 200 means the server sent the
+        # whole body, so overwrite
+        start = offset if response.status_code == 206 else 0
+        
+        if start:
+            # Drop anything past the last recorded byte (e.g. the
+            # preallocated tail of an attempt that was killed)
+            os.truncate(part_path, start)
+        else:
+            # Validators of the response being written, for a later resume
+            partial = {
+                'url': url,
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified')
+            }
+        
+        # Resumed downloads hash the bytes already on disk first
+        digest = hashlib.sha256()
+        if start:
+            with open(part_path, 'rb') as existing:
+                for block in iter(lambda: existing.read(DOWNLOAD_CHUNK_SIZE), b''):
+                    digest.update(block)
+        
         # Save to file
-        with open(output_path, 'wb') as f:
-            for chunk in response.iter_content(chunk_size=8192):
-                if chunk:
-                    f.write(chunk)
+        # Buffer matches the chunk size so short chunks from chunked
+        # transfer encoding are coalesced into full-size writes
+        with open(part_path, 'r+b' if start else 'wb', buffering=DOWNLOAD_CHUNK_SIZE) as f:
+            f.seek(start)
+            _write_partial_meta(meta_path, partial, start)
+            _preallocate(f, start, response)
+            checkpoint = start
+            try:
+                for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                    if chunk:
+                        digest.update(chunk)
+                        f.write(chunk)
+                        if f.tell() - checkpoint >= PROGRESS_CHECKPOINT_SIZE:
+                            # Record progress only once the bytes reach the file
+                            f.flush()
+                            checkpoint = f.tell()
+                            _write_partial_meta(meta_path, partial, checkpoint)
+            finally:
+                # Drop any preallocated tail so a resume starts at the
+                # last byte actually written
+                f.truncate(f.tell())
+        
+        actual = digest.hexdigest()
+        meta_path.unlink(missing_ok=True)
+        if expected and actual != expected:
+            part_path.unlink()
+            logger.error("✗ Checksum mismatch for %s: expected %s, got %s",
+                         output_path.name, expected, actual)
+            return 'failed'
+        
+        os.replace(part_path, output_path)
         
         file_size = output_path.stat().st_size
-        logger.info(f"✓ Downloaded {file_size:,} bytes to {output_path.name}")
-        return True
+        logger.info("✓ Downloaded %d bytes to %s", file_size, output_path.name)
+        
+        if cache:
+            cache.update(url, {
+                'etag': response.headers.get('ETag'),
+                'last_modified': response.headers.get('Last-Modified'),
+                'path': str(output_path),
+                'size': file_size,
+                'sha256': actual
+            })
+        
+        return 'downloaded'
         
     except requests.exceptions.RequestException as e:
-        logger.error(f"✗ Download failed: {e}")
-        return False
+        logger.error("✗ Download failed: %s", e)
+        return 'failed'
     except Exception as e:
-        logger.error(f"✗ Error: {e}")
-        return False
+        logger.error("✗ Error: %s", e)
+        return 'failed'
+
+
+def _read_partial_meta(meta_path: Path, url: str) -> Optional[Dict]:
+    """Resume record of a partial download of url, if there is a usable one"""
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    
+    if not isinstance(meta, dict) or meta.get('url') != url or not isinstance(meta.get('written'), int):
+        return None
+    return meta
+
+
+def _write_partial_meta(meta_path: Path, meta: Dict, written: int) -> None:
+    """Record a partial download's validators and bytes written so far"""
+    try:
+        tmp_path = meta_path.with_name(f"{meta_path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(json.dumps({**meta, 'written': written}), encoding='utf-8')
+        os.replace(tmp_path, meta_path)
+    except OSError as e:
+        logger.debug("Could not record download progress in %s: %s", meta_path, e)
+
+
+def _preallocate(f, start: int, response: requests.Response) -> None:
+    """
+    Reserve disk space for the rest of a download from its Content-Length
+    
+    Skipped for encoded bodies, where Content-Length is the compressed size
+    rather than the number of bytes that will be written.
+    """
+    length = response.headers.get('Content-Length')
+    if not length or response.headers.get('Content-Encoding', 'identity') != 'identity':
+        return
+    
+    try:
+        os.posix_fallocate(f.fileno(), start, int(length))
+    except (AttributeError, OSError, ValueError):
+        # Not available on this platform or filesystem
+        pass
 
 
-def fetch_scenario(scenario: Dict, scenarios_dir: Path) -> Dict:
+@lru_cache(maxsize=1024)
+def _derive_filename(url: str, bucket: str, safe_name: str) -> str:
+    """Generate a filename from the URL, or from bucket and scenario if it has none"""
+    filename = Path(urlparse(url).path).name
+    
+    if not filename or '.' not in filename:
+        filename = f"{bucket}_{safe_name}.pdf"
+    
+    return filename
+
+
+def _plan_output_paths(documents: List[Dict], scenario_dir: Path, safe_name: str) -> List[Path]:
+    """
+    Output path for each document, never shared by two different URLs
+    
+    URLs that differ only in their query (Notification.aspx?Id=1 and ?Id=2)
+    or have no filename at all derive the same name. Later ones get a
+    short hash of the URL appended, so concurrent downloads never write
+    the same file.
+    """
+    paths = []
+    owners: Dict[Path, str] = {}
+    
+    for doc in documents:
+        url = doc['url']
+        path = scenario_dir / doc['bucket'] / _derive_filename(url, doc['bucket'], safe_name)
+        
+        taken_by = owners.setdefault(path, url)
+        if taken_by != url:
+            url_hash = hashlib.sha256(url.encode('utf-8')).hexdigest()[:8]
+            path = path.with_name(f"{path.stem}_{url_hash}{path.suffix}")
+            if owners.setdefault(path, url) != url:
+                raise ValueError(f"Documents {owners[path]} and {url} both map to {path}")
+            logger.info("Saving %s as %s (name already used by %s)", url, path.name, taken_by)
+        
+        paths.append(path)
+    
+    return paths
+
+
+def fetch_scenario(scenario: Dict,
+                   scenarios_dir: Path,
+                   cache: Optional[FetchCache] = None,
+                   sources: Optional[SourceRegistry] = None) -> Dict:
     """
     Fetch all documents for a scenario
     
+    Each unique URL is downloaded once; further documents with the same URL
+    are hardlinked to the first copy.
+    
     Args:
         scenario: Scenario configuration
         scenarios_dir: Base scenarios directory
+        cache: Optional validator cache used to revalidate existing files
+        sources: Optional registry shared across scenarios; URLs claimed
+            by another scenario are linked rather than downloaded again
     
     Returns:
         Summary of download results
     """
+    if sources is None:
+        sources = SourceRegistry()
+    
     scenario_name = scenario['name']
-    logger.info(f"\n{'='*60}")
-    logger.info(f"Scenario: {scenario_name}")
+    logger.info("\n%s", '='*60)
+    logger.info("Scenario: %s", scenario_name)
     logger.info('='*60)
     
     # Create scenario directory (sanitize name)
@@ -99,66 +495,159 @@ def fetch_scenario(scenario: Dict, scenarios_dir: Path) -> Dict:
         'failed': 0
     }
     
-    for doc in scenario.get('documents', []):
-        label = doc['label']
-        bucket = doc['bucket']
-        url = doc['url']
-        
-        # Generate filename from URL
-        parsed_url = urlparse(url)
-        filename = Path(parsed_url.path).name
-        
-        # If no filename in URL, generate one
-        if not filename or '.' not in filename:
-            filename = f"{bucket}_{safe_name}.pdf"
-        
-        # Output path
-        output_path = scenario_dir / bucket / filename
-        
-        logger.info(f"\n{label} ({bucket}):")
-        
-        # Skip if already exists
-        if output_path.exists():
-            logger.info(f"  ⚠ Already exists: {output_path.name}")
-            results['documents'].append({
-                'label': label,
-                'bucket': bucket,
-                'status': 'exists',
-                'path': str(output_path)
-            })
+    docs = scenario.get('documents', [])
+    plan = [
+        (doc['label'], doc['bucket'], doc['url'], output_path, doc.get('sha256'))
+        for doc, output_path in zip(docs, _plan_output_paths(docs, scenario_dir, safe_name))
+    ]
+    
+    if not plan:
+        return results
+    
+    # Create output directories once, before any worker starts
+    for bucket_dir in {item[3].parent for item in plan}:
+        bucket_dir.mkdir(parents=True, exist_ok=True)
+    
+    # Only the first document for each URL not claimed by another
+    # scenario is downloaded
+    to_download = [i for i, (_, _, url, _, _) in enumerate(plan) if sources.claim(url)]
+    
+    documents = [None] * len(plan)
+    
+    # Downloads are independent network I/O, so run them concurrently;
+    # map() keeps the results in document order
+    try:
+        if to_download:
+            with ThreadPoolExecutor(max_workers=min(DOWNLOAD_WORKERS, len(to_download))) as executor:
+                downloaded = executor.map(lambda i: fetch_document(*plan[i], cache=cache), to_download)
+                for i, document in zip(to_download, downloaded):
+                    documents[i] = document
+                    if document['status'] != 'failed':
+                        sources.publish(plan[i][2], Path(document['path']))
+    finally:
+        # Release every claim, even on error, so no other scenario waits forever
+        for i in to_download:
+            if documents[i] is None or documents[i]['status'] == 'failed':
+                sources.publish(plan[i][2], None)
+    
+    for i, item in enumerate(plan):
+        if documents[i] is None:
+            documents[i] = link_document(*item[:4], source=sources.wait(item[2]))
+    
+    for document in documents:
+        results['documents'].append(document)
+        if document['status'] == 'failed':
+            results['failed'] += 1
+        else:
             results['success'] += 1
-            continue
-        
-        # Download
-        success = download_file(url, output_path)
-        
-        if success:
-            results['documents'].append({
+    
+    return results
+
+
+def fetch_document(label: str,
+                   bucket: str,
+                   url: str,
+                   output_path: Path,
+                   sha256: Optional[str] = None,
+                   cache: Optional[FetchCache] = None) -> Dict:
+    """
+    Fetch one scenario document unless it is already present
+    
+    Args:
+        label: Document label from the scenario config
+        bucket: Bucket (subdirectory) the document belongs to
+        url: URL to download from
+        output_path: Path to save the file
+        sha256: Optional expected hex digest of the document
+        cache: Optional validator cache; existing files with cached
+            validators are revalidated rather than skipped
+    
+    Returns:
+        Result entry with a 'status' of 'exists', 'downloaded' or 'failed'
+    """
+    logger.info("\n%s (%s):", label, bucket)
+    
+    # Skip if already exists and there is nothing to revalidate against,
+    # unless it fails the expected checksum
+    if output_path.exists() and not (cache and cache.get(url)):
+        if not sha256 or _file_sha256(output_path) == sha256.lower():
+            logger.info("  ⚠ Already exists: %s", output_path.name)
+            return {
                 'label': label,
                 'bucket': bucket,
-                'status': 'downloaded',
+                'status': 'exists',
                 'path': str(output_path)
-            })
-            results['success'] += 1
-        else:
-            results['documents'].append({
-                'label': label,
-                'bucket': bucket,
-                'status': 'failed',
-                'url': url
-            })
-            results['failed'] += 1
+            }
+        logger.warning("  ⚠ Checksum mismatch, re-downloading: %s", output_path.name)
     
-    return results
+    # Download (or revalidate)
+    status = _download(url, output_path, cache, sha256)
+    
+    if status != 'failed':
+        return {
+            'label': label,
+            'bucket': bucket,
+            'status': 'exists' if status == 'unchanged' else 'downloaded',
+            'path': str(output_path)
+        }
+    
+    return {
+        'label': label,
+        'bucket': bucket,
+        'status': 'failed',
+        'url': url
+    }
 
 
-def main():
+def link_document(label: str, bucket: str, url: str, output_path: Path, source: Optional[Path]) -> Dict:
+    """
+    Place a copy of an already fetched document at output_path
+    
+    Hardlinks when source and destination share a filesystem, otherwise
+    copies. A source of None means the URL failed to download.
+    
+    Returns:
+        Result entry with a 'status' of 'exists', 'linked' or 'failed'
+    """
+    logger.info("\n%s (%s):", label, bucket)
+    
+    if source is None:
+        logger.error("  ✗ Not available: %s", url)
+        return {'label': label, 'bucket': bucket, 'status': 'failed', 'url': url}
+    
+    if output_path.exists() and os.path.samefile(source, output_path):
+        logger.info("  ⚠ Already exists: %s", output_path.name)
+        return {'label': label, 'bucket': bucket, 'status': 'exists', 'path': str(output_path)}
+    
+    # Build the link beside the destination, then swap it in atomically
+    tmp_path = output_path.with_name(output_path.name + '.link')
+    try:
+        tmp_path.unlink(missing_ok=True)
+        try:
+            os.link(source, tmp_path)
+        except OSError:
+            shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, output_path)
+    except OSError as e:
+        logger.error("  ✗ Could not link %s: %s", source.name, e)
+        return {'label': label, 'bucket': bucket, 'status': 'failed', 'url': url}
+    
+    logger.info("  ✓ Linked to %s", source)
+    return {'label': label, 'bucket': bucket, 'status': 'linked', 'path': str(output_path)}
+
+
+def main(argv: Optional[List[str]] = None):
     """Main fetcher function"""
+    parser = argparse.ArgumentParser(description='Fetch RegDelta scenario documents')
+    parser.add_argument('--jobs', type=int, default=4,
+                        help='Number of scenarios to fetch concurrently (default: 4)')
+    args = parser.parse_args(argv)
+    
     logger.info("RegDelta Document Fetcher")
     logger.info("=" * 60)
     
     # Paths
-    project_root = Path(__file__).parent
+    project_root = Path(__file__).resolve().parent
     fetch_config_file = project_root / "data" / "fetch_config.yml"
     scenarios_dir = project_root / "scenarios"
     
@@ -166,7 +655,7 @@ def main():
     try:
         config = load_fetch_config(fetch_config_file)
     except Exception as e:
-        logger.error(f"Failed to load config: {e}")
+        logger.error("Failed to load config: %s", e)
         return 1
     
     scenarios = config.get('scenarios', [])
@@ -174,14 +663,23 @@ def main():
         logger.warning("No scenarios found in config")
         return 1
     
-    logger.info(f"Found {len(scenarios)} scenarios to fetch\n")
+    logger.info("Found %d scenarios to fetch\n", len(scenarios))
+    
+    # Fetch scenarios concurrently; each one also downloads its documents
+    # in parallel
+    scenarios_dir.mkdir(parents=True, exist_ok=True)
+    cache = FetchCache(scenarios_dir / ".fetch_cache.json")
+    # Shared so a URL used by several scenarios is fetched once
+    sources = SourceRegistry()
     
-    # Fetch each scenario
-    all_results = []
+    with ThreadPoolExecutor(max_workers=max(1, min(args.jobs, len(scenarios)))) as executor:
+        futures = [
+            executor.submit(fetch_scenario, scenario, scenarios_dir, cache, sources)
+            for scenario in scenarios
+        ]
+        all_results = [future.result() for future in futures]
     
-    for scenario in scenarios:
-        results = fetch_scenario(scenario, scenarios_dir)
-        all_results.append(results)
+    cache.save()
     
     # Print summary
     logger.info("\n" + "=" * 60)
@@ -191,15 +689,17 @@ def main():
     total_success = sum(r['success'] for r in all_results)
     total_failed = sum(r['failed'] for r in all_results)
     
-    for result in all_results:
-        logger.info(f"\n{result['scenario']}:")
-        logger.info(f"  ✓ Success: {result['success']}")
-        if result['failed'] > 0:
-            logger.info(f"  ✗ Failed: {result['failed']}")
+    # The per-scenario report is only worth building if INFO is emitted
+    if logger.isEnabledFor(logging.INFO):
+        for result in all_results:
+            logger.info("\n%s:", result['scenario'])
+            logger.info("  ✓ Success: %d", result['success'])
+            if result['failed'] > 0:
+                logger.info("  ✗ Failed: %d", result['failed'])
     
-    logger.info(f"\n{'='*60}")
-    logger.info(f"Total: {total_success} successful, {total_failed} failed")
-    logger.info(f"Documents saved to: {scenarios_dir}")
+    logger.info("\n%s", '='*60)
+    logger.info("Total: %d successful, %d failed", total_success, total_failed)
+    logger.info("Documents saved to: %s", scenarios_dir)
     logger.info("=" * 60)
     
     return 0 if total_failed == 0 else 1
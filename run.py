@@ -8,14 +8,10 @@ from pathlib import Path
 import sys
 
 # Add project root to Python path
-project_root = Path(__file__).parent
+project_root = Path(__file__).resolve().parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
-from utils.config import get_config, setup_logging
-from utils.audit import get_audit_logger
-from agents.planner import PlannerAgent
-
 
 def main():
     parser = argparse.ArgumentParser(description='RegDelta - Local Compliance Impact Analysis')
@@ -31,15 +27,6 @@ def main():
     print("RegDelta - Local Compliance Impact Analysis")
     print("=" * 60)
     
-    config = get_config()
-    setup_logging(config)
-    config.ensure_directories()
-    
-    audit_logger = get_audit_logger()
-    
-    # Create planner
-    planner = PlannerAgent(config, audit_logger)
-    
     # Get file paths
     baseline_path = Path(args.baseline) if args.baseline else None
     new_path = Path(args.new)
@@ -52,6 +39,21 @@ def main():
         print(f"Error: Baseline PDF not found: {baseline_path}")
         sys.exit(1)
     
+    # Imported only once the inputs are validated: the planner pulls in
+    # sentence-transformers, faiss and pandas, which take seconds to load
+    from utils.config import get_config, setup_logging
+    from utils.audit import get_audit_logger
+    from agents.planner import PlannerAgent
+    
+    config = get_config()
+    setup_logging(config)
+    config.ensure_directories()
+    
+    audit_logger = get_audit_logger()
+    
+    # Create planner
+    planner = PlannerAgent(config, audit_logger)
+    
     # Run pipeline
     print("\nRunning full pipeline...")
     results = planner.run_full_pipeline(
@@ -4,26 +4,88 @@ Dark-themed interface for compliance impact analysis
 """
 
 import sys
+import mmap
+import hashlib
+import threading
+from collections import deque, namedtuple
 from pathlib import Path
 
 # Add project root to Python path
-project_root = Path(__file__).parent.parent
+project_root = Path(__file__).resolve().parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
 import streamlit as st
 import pandas as pd
+import numpy as np
 import json
-from datetime import datetime
+import re
 
 from utils.config import get_config, setup_logging
 from utils.audit import get_audit_logger
-from agents.planner import PlannerAgent
-from agents.actions import create_actions_agent
+from agents.extractor import SEVERITY_NAMES, ObligationBatch
+from agents.mapper import MAPPING_STATUSES
 import subprocess
-import yaml
 import os
 
+# Option lists longer than this get a text filter in front of the selectbox,
+# which then shows at most SELECT_MAX_OPTIONS matches
+SELECT_FILTER_THRESHOLD = 200
+SELECT_MAX_OPTIONS = 100
+
+# Audit trails larger than this are only read after an explicit request
+AUDIT_PREPARE_THRESHOLD = 50 * 1024 * 1024
+
+# Bump whenever the pickled planner state (obligations, mappings, diff) changes
+# layout, so disk-persisted pipeline runs from older versions are not reused
+PIPELINE_STATE_VERSION = 2
+
+# Config sections that change what the pipeline produces for the same PDFs
+PIPELINE_CONFIG_SECTIONS = ('extract', 'controls', 'mapping', 'lexicon')
+
+# Table columns; rows are built as tuples in this order
+OBLIGATION_COLS = ('Section', 'Severity', 'Text', 'Modal Phrases', 'Deadline', 'Citations')
+MAPPING_COLS = ('Section', 'Obligation', 'Control ID', 'Control Title', 'Score', 'Cosine', 'Lexical', 'Status')
+ACTION_COLS = ('Summary', 'Control ID', 'Owner', 'Priority', 'Due Date', 'System', 'Status')
+DIFF_COLS = ('Op', 'Old Preview', 'New Preview')
+
+# Result views, in display order
+RESULT_VIEWS = (
+    "📝 Obligations",
+    "🔗 Mappings",
+    "📊 Diff Summary",
+    "✅ Actions",
+    "💾 Exports"
+)
+
+# Changed sections shown in the diff table, and paragraphs previewed per side
+DIFF_MAX_ROWS = 200
+DIFF_PREVIEW_PARAGRAPHS = 3
+
+# Low-cardinality columns are stored as categoricals
+SEVERITY_DTYPE = pd.CategoricalDtype(
+    [name.upper() for name in reversed(SEVERITY_NAMES)], ordered=True
+)
+STATUS_DTYPE = pd.CategoricalDtype(MAPPING_STATUSES)
+
+# Long text columns are held as Arrow strings so st.dataframe can ship the
+# Arrow buffer as-is instead of converting Python str objects (streamlit
+# itself requires pyarrow)
+TEXT_DTYPE = 'string[pyarrow]'
+
+# Counts for one pipeline run, computed once after it finishes
+PlannerStats = namedtuple('PlannerStats', ['obligations', 'mappings', 'mapped_ids'])
+
+# Row styles for the obligations table, by Severity value (low otherwise)
+SEVERITY_ROW_STYLES = {
+    # Light red background with dark text
+    'HIGH': 'background-color: rgba(254, 226, 226, 0.8); color: #991b1b; font-weight: 600;',
+    # Light orange background with dark text
+    'MEDIUM': 'background-color: rgba(254, 243, 199, 0.8); color: #92400e; font-weight: 600;',
+    # Light green background with dark text
+    'LOW': 'background-color: rgba(220, 252, 231, 0.8); color: #065f46; font-weight: 600;'
+}
+
 # Page config
 st.set_page_config(
     page_title="RegDelta - Local Compliance Impact Analysis",
@@ -33,7 +95,7 @@ st.set_page_config(
 )
 
 # Light theme CSS with better visibility
-st.markdown("""
+PAGE_CSS = """
 <style>
     .main {
         background-color: #f5f7fa;
@@ -114,7 +176,19 @@ st.markdown("""
         color: #1a202c;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+
+@st.cache_resource
+def _minified_css() -> str:
+    """PAGE_CSS with whitespace collapsed, computed once per process"""
+    css = re.sub(r'\s+', ' ', PAGE_CSS).strip()
+    return re.sub(r'\s*([{};,>])\s*|(:)\s+', r'\1\2', css)
+
+
+# Streamlit drops any element a rerun does not emit, so the style block
+# has to be sent every run; only its construction is cached
+st.markdown(_minified_css(), unsafe_allow_html=True)
 
 
 @st.cache_resource
@@ -130,53 +204,502 @@ def init_system():
 @st.cache_resource
 def init_planner(_config, _audit_logger):
     """Initialize planner agent (cached)"""
+    # Imported on first use so the page can render before the agents load
+    from agents.planner import PlannerAgent
+    
     planner = PlannerAgent(_config, _audit_logger)
     return planner
 
 
-def get_available_scenarios(scenarios_dir: Path):
-    """Get list of available scenarios from scenarios directory"""
-    if not scenarios_dir.exists():
+def _mtime_ns(path: Path) -> int:
+    """Directory mtime used to key the scan caches (0 if missing)"""
+    try:
+        return path.stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+@st.cache_data(show_spinner=False, ttl=30)
+def _scan_scenarios(scenarios_dir: str, mtime_ns: int):
+    """List scenario directory names (cached per directory mtime)"""
+    path = Path(scenarios_dir)
+    if not path.exists():
         return []
     
-    scenarios = []
-    for item in scenarios_dir.iterdir():
-        if item.is_dir():
-            scenarios.append(item.name)
-    
-    return sorted(scenarios)
+    return sorted(item.name for item in path.iterdir() if item.is_dir())
 
 
-def get_scenario_documents(scenarios_dir: Path, scenario_name: str):
-    """Get baseline and new documents for a scenario"""
-    scenario_path = scenarios_dir / scenario_name
-    
+@st.cache_data(show_spinner=False, ttl=30)
+def _scan_scenario_documents(scenario_path: str, mtimes: tuple):
+    """List PDF names per bucket (cached per bucket directory mtimes)"""
     documents = {
         'baseline': [],
         'new': []
     }
     
-    for bucket in ['baseline', 'new']:
-        bucket_path = scenario_path / bucket
+    for bucket in documents:
+        bucket_path = Path(scenario_path) / bucket
         if bucket_path.exists():
-            for pdf in bucket_path.glob('*.pdf'):
-                documents[bucket].append(pdf)
+            documents[bucket] = [pdf.name for pdf in bucket_path.glob('*.pdf')]
     
     return documents
 
 
-def fetch_real_circulars():
-    """Run the fetch_documents.py script"""
+def get_available_scenarios(scenarios_dir: Path):
+    """Get list of available scenarios from scenarios directory"""
+    return _scan_scenarios(str(scenarios_dir), _mtime_ns(scenarios_dir))
+
+
+def get_scenario_documents(scenarios_dir: Path, scenario_name: str):
+    """Get baseline and new documents for a scenario, as {bucket: {name: path}}"""
+    scenario_path = scenarios_dir / scenario_name
+    
+    # Adding or removing a PDF changes its bucket directory's mtime, which
+    # invalidates the cached scan
+    names = _scan_scenario_documents(
+        str(scenario_path),
+        (_mtime_ns(scenario_path / 'baseline'), _mtime_ns(scenario_path / 'new'))
+    )
+    
+    return {
+        bucket: {name: scenario_path / bucket / name for name in bucket_names}
+        for bucket, bucket_names in names.items()
+    }
+
+
+def filter_options(label: str, options, key: str):
+    """
+    Narrow a long option list with a text filter before it reaches a selectbox
+    
+    Selectboxes with thousands of options make every rerun and dropdown
+    interaction sluggish (streamlit#7104, streamlit#1888), so large lists
+    are filtered and capped, mirroring the display_max workaround.
+    """
+    if len(options) <= SELECT_FILTER_THRESHOLD:
+        return options
+    
+    query = st.text_input(f"Filter {label}", "", key=key).strip().lower()
+    matches = [option for option in options if query in option.lower()]
+    
+    if not matches:
+        st.caption(f"No {label} match '{query}'")
+        matches = options
+    
+    if len(matches) > SELECT_MAX_OPTIONS:
+        st.caption(f"Showing first {SELECT_MAX_OPTIONS} of {len(matches)} {label}")
+    
+    return matches[:SELECT_MAX_OPTIONS]
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_obligations_df(run_key: tuple, _obligations):
+    """Obligations table for one pipeline run (all severities), built column-wise"""
+    batch = _obligations
+    if not isinstance(batch, ObligationBatch):
+        batch = ObligationBatch.from_obligations(list(_obligations))
+    
+    # SEVERITY_DTYPE lists the names in reverse code order
+    severity = pd.Categorical.from_codes(
+        len(SEVERITY_NAMES) - 1 - batch.severities, dtype=SEVERITY_DTYPE
+    )
+    text = pd.Series(batch.texts, dtype=TEXT_DTYPE).str[:200] + '...'
+    modal_phrases = pd.Series(batch.modal_phrases, dtype=object).str[:3].str.join(', ')
+    citations = pd.Series(batch.citations, dtype=object)
+    citations = citations.str[:2].str.join(', ').where(citations.str.len() > 0, '-')
+    
+    # Joined columns go in as lists so their string dtype is inferred as
+    # for the other columns
+    return pd.DataFrame(
+        dict(zip(OBLIGATION_COLS, (
+            batch.section_ids,
+            severity,
+            text,
+            modal_phrases.tolist(),
+            np.where(batch.has_deadline, '✓', '✗'),
+            citations.tolist()
+        )))
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_mappings_df(run_key: tuple, _mappings):
+    """Flat control mappings table for one pipeline run (all statuses)"""
+    df = pd.DataFrame.from_records(
+        (
+            (
+                section_id,
+                mapping.obligation_text[:100] + '...',
+                mapping.control_id,
+                mapping.control_title,
+                f"{mapping.score:.3f}",
+                f"{mapping.cosine_score:.3f}",
+                f"{mapping.lexical_score:.3f}",
+                mapping.status
+            )
+            for section_id, mappings in _mappings.items()
+            for mapping in mappings
+        ),
+        columns=MAPPING_COLS
+    )
+    df['Status'] = df['Status'].astype(STATUS_DTYPE)
+    df['Obligation'] = df['Obligation'].astype(TEXT_DTYPE)
+    return df
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_diff_df(run_key: tuple, _changed):
+    """Changed sections table for one pipeline run, capped at DIFF_MAX_ROWS"""
+    return pd.DataFrame.from_records(
+        (
+            (
+                op.op.upper(),
+                ' / '.join(op.old_text[:DIFF_PREVIEW_PARAGRAPHS]),
+                ' / '.join(op.new_text[:DIFF_PREVIEW_PARAGRAPHS])
+            )
+            for op in _changed[:DIFF_MAX_ROWS]
+        ),
+        columns=DIFF_COLS
+    ).astype({'Old Preview': TEXT_DTYPE, 'New Preview': TEXT_DTYPE})
+
+
+@st.cache_resource
+def _actions_agent(default_due_days: int):
+    """Shared actions agent per default deadline"""
+    from agents.actions import create_actions_agent
+    
+    return create_actions_agent(default_due_days)
+
+
+def planner_stats(planner) -> PlannerStats:
+    """Obligation and mapping counts, plus the mapped control IDs"""
+    return PlannerStats(
+        obligations=len(planner.obligations),
+        mappings=sum(len(m) for m in planner.mappings.values()),
+        mapped_ids=frozenset(
+            m.control_id
+            for maps in planner.mappings.values()
+            for m in maps
+            if m.status in ('accepted', 'review')
+        )
+    )
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _action_plan(run_key: tuple, default_due_days: int, _planner, _mapped_ids):
+    """
+    Actions and evidence schedules for one pipeline run
+    
+    Args:
+        _mapped_ids: Control IDs with an accepted or review mapping
+    
+    Returns:
+        (actions, evidence runs), with None for the evidence runs when
+        no controls are mapped
+    """
+    actions_agent = _actions_agent(default_due_days)
+    
+    actions = actions_agent.generate_actions(
+        _planner.obligations,
+        _planner.mappings,
+        _planner.mapper.controls
+    )
+    
+    # The actual Control objects for those IDs, in catalog order
+    controls_used = [
+        ctrl for ctrl in _planner.mapper.controls
+        if ctrl.control_id in _mapped_ids
+    ]
+    
+    if not controls_used:
+        return actions, None
+    
+    evidence_runs = actions_agent.generate_evidence_schedules(
+        controls_used[:10],  # Limit for demo
+        cadence_preset='quarterly'
+    )
+    return actions, evidence_runs
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _build_actions_df(run_key: tuple, _actions):
+    """Action items table for one pipeline run"""
+    df = pd.DataFrame.from_records(
+        (
+            (
+                action.summary,
+                action.control_id,
+                action.owner,
+                SEVERITY_NAMES[action.priority].upper(),
+                action.due_date,
+                action.system,
+                action.status
+            )
+            for action in _actions
+        ),
+        columns=ACTION_COLS
+    )
+    df['Priority'] = df['Priority'].astype(SEVERITY_DTYPE)
+    return df
+
+
+def _to_json_bytes(data) -> bytes:
+    """Indented JSON as bytes, via orjson when it is installed"""
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(data, indent=2).encode('utf-8')
+    
+    return orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _obligations_json(run_key: tuple, _obligations) -> bytes:
+    """Obligations export payload for one pipeline run"""
+    if not isinstance(_obligations, ObligationBatch):
+        return _to_json_bytes([ob.to_dict() for ob in _obligations])
+    
+    # Same records as Obligation.to_dict, read straight from the batch's
+    # columns rather than materializing an Obligation per row
+    return _to_json_bytes([
+        {
+            'section_id': section_id,
+            'text': text,
+            'severity': SEVERITY_NAMES[severity],
+            'citations': citations,
+            'modal_phrases': modal_phrases,
+            'has_deadline': has_deadline
+        }
+        for section_id, text, severity, citations, modal_phrases, has_deadline in zip(
+            _obligations.section_ids,
+            _obligations.texts,
+            _obligations.severities.tolist(),
+            _obligations.citations,
+            _obligations.modal_phrases,
+            _obligations.has_deadline.tolist()
+        )
+    ])
+
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def _mappings_json(run_key: tuple, _mappings) -> bytes:
+    """Mappings export payload for one pipeline run"""
+    # Not derived from the mappings table: its text is cut to 100 chars and
+    # its scores are preformatted strings, while the export keeps to_dict's
+    # 200-char text, rounded floats and reviewer fields
+    return _to_json_bytes({
+        section_id: [m.to_dict() for m in maps]
+        for section_id, maps in _mappings.items()
+    })
+
+
+@st.cache_data(show_spinner=False, max_entries=1)
+def _read_audit_file(path: str, size: int, mtime_ns: int) -> bytes:
+    """Audit trail contents, re-read only when its size or mtime changes"""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _atomic_write(path: Path, data: bytes):
+    """
+    Write bytes to path through a temp file and an atomic rename
+    
+    The space is reserved up front with posix_fallocate where supported,
+    and the payload goes out in as few os.write calls as the kernel allows.
+    """
+    tmp_path = path.with_name(path.name + '.tmp')
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        if data:
+            try:
+                os.posix_fallocate(fd, 0, len(data))
+            except (AttributeError, OSError):
+                # Not available on this platform or filesystem
+                pass
+        
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+    
+    os.replace(tmp_path, path)
+
+
+def _file_hash(path: Path) -> str:
+    """Content hash of a file, used to key cached pipeline runs"""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap can't map an empty file
+            return hashlib.blake2b(b'', digest_size=16).hexdigest()
+        
+        # Hash straight from the page cache instead of reading into bytes
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return hashlib.blake2b(mm, digest_size=16).hexdigest()
+
+
+def _pipeline_inputs_hash(config) -> str:
+    """
+    Content hash of everything besides the PDFs that shapes a pipeline run
+    
+    Covers the lexicon, the control catalogs and the config sections the
+    extractor and mapper read, so editing any of them misses the cached
+    runs persisted on disk instead of serving stale obligations and mappings.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    
+    sections = {name: config.get(name) for name in PIPELINE_CONFIG_SECTIONS}
+    digest.update(json.dumps(sections, sort_keys=True, default=str).encode('utf-8'))
+    
+    for path in [config.lexicon_file] + [config.catalog_dir / name for name in config.catalogs]:
+        digest.update(_file_hash(path).encode('ascii') if path.exists() else b'-')
+    
+    return digest.hexdigest()
+
+
+class _PipelineFailed(Exception):
+    """Raised out of the cached pipeline runner so failed runs aren't cached"""
+    
+    def __init__(self, results):
+        super().__init__(results.get('error', 'Unknown error'))
+        self.results = results
+
+
+@st.cache_data(persist='disk', show_spinner=False, max_entries=16)
+def _run_pipeline_cached(baseline_hash, new_hash, scenario, inputs_hash, state_version,
+                         _planner, _baseline_pdf, _new_pdf, _ran):
+    """
+    Pipeline results and planner state for one PDF pair
+    
+    Persisted under ~/.streamlit/cache, so re-running the same documents
+    after a refresh or server restart skips ingest, diff, extract and map.
+    """
+    _ran.append(True)
+    results = _planner.run_full_pipeline(
+        baseline_pdf=_baseline_pdf,
+        new_pdf=_new_pdf,
+        scenario_name=scenario
+    )
+    
+    if results.get('status') != 'success':
+        raise _PipelineFailed(results)
+    
+    return results, (_planner.obligations, _planner.mappings, _planner.diff_result)
+
+
+def run_pipeline(planner, baseline_pdf, new_pdf, scenario):
+    """
+    Run the pipeline, reusing a cached run of the same document contents
+    
+    Returns:
+        (results, whether they came from the cache)
+    """
+    ran = []
+    baseline_hash = _file_hash(baseline_pdf) if baseline_pdf else None
+    new_hash = _file_hash(new_pdf)
     try:
-        result = subprocess.run(
-            [sys.executable, 'fetch_documents.py'],
-            capture_output=True,
+        results, state = _run_pipeline_cached(
+            baseline_hash,
+            new_hash,
+            scenario,
+            _pipeline_inputs_hash(planner.config),
+            PIPELINE_STATE_VERSION,
+            planner,
+            baseline_pdf,
+            new_pdf,
+            ran
+        )
+    except _PipelineFailed as e:
+        return e.results, False
+    
+    # The cache returns copies; on a hit the planner never ran at all
+    planner.obligations, planner.mappings, planner.diff_result = state
+    planner.current_scenario = scenario
+    if not planner.mapper:
+        planner.initialize_agents()
+    
+    if not ran:
+        # The analysis was served from the cache; record it in the trail
+        planner.audit.log(
+            actor="planner",
+            action="pipeline_cache_hit",
+            payload={
+                'scenario': scenario,
+                'baseline_hash': baseline_hash,
+                'new_hash': new_hash
+            },
+            durable=True
+        )
+    
+    return results, not ran
+
+
+def save_upload(uploaded, path: Path, state_key: str):
+    """
+    Write an uploaded file to path unless that content is already there
+    
+    The script reruns on every interaction, so the digest of the last write
+    is kept in session state and unchanged uploads are not rewritten.
+    getvalue() is used rather than read(), which would leave the buffer
+    exhausted on later reruns.
+    """
+    data = uploaded.getvalue()
+    written = (str(path), hashlib.blake2b(data, digest_size=16).hexdigest())
+    
+    if st.session_state.get(state_key) == written and path.exists():
+        return
+    
+    path.parent.mkdir(parents=True, exist_ok=True)
+    _atomic_write(path, data)
+    st.session_state[state_key] = written
+
+
+def fetch_real_circulars(progress=None, timeout: int = 300):
+    """
+    Run the fetch_documents.py script, streaming its output
+    
+    Args:
+        progress: Optional st.empty() placeholder showing the latest line
+        timeout: Seconds before the fetch is killed (5 minutes)
+    
+    Returns:
+        (success, last 50 lines of output, error message)
+    """
+    try:
+        proc = subprocess.Popen(
+            [sys.executable, str(project_root / 'fetch_documents.py')],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            timeout=300  # 5 minute timeout
+            bufsize=1
         )
-        return result.returncode == 0, result.stdout, result.stderr
     except Exception as e:
         return False, "", str(e)
+    
+    # Only the tail is kept, so a chatty fetch doesn't pile up in memory
+    tail = deque(maxlen=50)
+    timed_out = threading.Event()
+    
+    def kill():
+        timed_out.set()
+        proc.kill()
+    
+    killer = threading.Timer(timeout, kill)
+    killer.start()
+    try:
+        for line in proc.stdout:
+            line = line.rstrip()
+            tail.append(line)
+            if progress is not None and line:
+                progress.text(line[:200])
+        proc.wait()
+    finally:
+        killer.cancel()
+        proc.stdout.close()
+    
+    if timed_out.is_set():
+        return False, '\n'.join(tail), f"Fetch timed out after {timeout}s"
+    
+    return proc.returncode == 0, '\n'.join(tail), ""
 
 
 def main():
@@ -195,16 +718,21 @@ def main():
         
         if st.button("🌐 Fetch Real Circulars", use_container_width=True):
             with st.spinner("Downloading regulatory documents..."):
-                success, stdout, stderr = fetch_real_circulars()
+                progress = st.empty()
+                success, output, error = fetch_real_circulars(progress)
+                progress.empty()
                 
                 if success:
+                    st.cache_data.clear()
                     st.success("✓ Documents fetched successfully!")
-                    st.text(stdout[-500:] if len(stdout) > 500 else stdout)  # Show last 500 chars
+                    st.text(output[-500:])  # Show last 500 chars
                     st.rerun()  # Reload to show new scenarios
                 else:
                     st.error("✗ Fetch failed")
-                    if stderr:
-                        st.error(stderr)
+                    if error:
+                        st.error(error)
+                    if output:
+                        st.text(output[-500:])
         
         st.divider()
         
@@ -216,7 +744,7 @@ def main():
         if available_scenarios:
             scenario = st.selectbox(
                 "Select Scenario",
-                options=available_scenarios,
+                options=filter_options("scenarios", available_scenarios, 'scenario_filter'),
                 index=0
             )
             
@@ -228,7 +756,9 @@ def main():
             baseline_path = None
             
             if scenario_docs['baseline']:
-                baseline_options = ["None"] + [f.name for f in scenario_docs['baseline']]
+                baseline_options = ["None"] + filter_options(
+                    "baseline PDFs", list(scenario_docs['baseline']), 'baseline_filter'
+                )
                 baseline_choice = st.selectbox(
                     "Baseline PDF",
                     options=baseline_options,
@@ -236,7 +766,7 @@ def main():
                 )
                 
                 if baseline_choice != "None":
-                    baseline_path = next(f for f in scenario_docs['baseline'] if f.name == baseline_choice)
+                    baseline_path = scenario_docs['baseline'][baseline_choice]
                     st.caption(f"📄 {baseline_path.name}")
             else:
                 st.caption("ℹ️ No baseline PDFs in this scenario")
@@ -246,14 +776,14 @@ def main():
             new_path = None
             
             if scenario_docs['new']:
-                new_options = [f.name for f in scenario_docs['new']]
+                new_options = filter_options("new PDFs", list(scenario_docs['new']), 'new_filter')
                 new_choice = st.selectbox(
                     "New PDF",
                     options=new_options,
                     index=0
                 )
                 
-                new_path = next(f for f in scenario_docs['new'] if f.name == new_choice)
+                new_path = scenario_docs['new'][new_choice]
                 st.caption(f"📄 {new_path.name}")
             else:
                 st.warning("⚠️ No new PDFs in this scenario")
@@ -329,15 +859,11 @@ def main():
     if uploaded_new:
         # Save uploaded files
         final_new_path = Path(config.scenarios_dir) / final_scenario / "new" / uploaded_new.name
-        final_new_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(final_new_path, 'wb') as f:
-            f.write(uploaded_new.read())
+        save_upload(uploaded_new, final_new_path, 'uploaded_new_digest')
         
         if uploaded_baseline:
             final_baseline_path = Path(config.scenarios_dir) / final_scenario / "baseline" / uploaded_baseline.name
-            final_baseline_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(final_baseline_path, 'wb') as f:
-                f.write(uploaded_baseline.read())
+            save_upload(uploaded_baseline, final_baseline_path, 'uploaded_baseline_digest')
     elif 'new_path' in locals() and new_path:
         # Use scenario files
         final_new_path = new_path
@@ -356,6 +882,7 @@ def main():
     with col2:
         if st.button("🔄 Reload Data", use_container_width=True):
             st.cache_resource.clear()
+            st.cache_data.clear()
             st.session_state.clear()
             st.rerun()
     
@@ -363,6 +890,7 @@ def main():
         if st.button("🗑️ Clear Results", use_container_width=True):
             if 'results' in st.session_state:
                 del st.session_state['results']
+            st.session_state.pop('stats', None)
             st.rerun()
     
     # Run pipeline
@@ -379,21 +907,21 @@ def main():
             # Clear old results first
             if 'results' in st.session_state:
                 del st.session_state['results']
+            st.session_state.pop('stats', None)
             
             with st.spinner("Running full pipeline..."):
-                results = planner.run_full_pipeline(
-                    baseline_pdf=baseline_path,
-                    new_pdf=new_path,
-                    scenario_name=scenario
-                )
+                results, cached = run_pipeline(planner, baseline_path, new_path, scenario)
                 st.session_state.results = results
                 st.session_state.planner = planner
                 
                 # Save state
                 planner.save_state(config.data_dir)
+                st.session_state.stats = planner_stats(planner)
                 
                 # Show success message with duration
-                if results.get('status') == 'success':
+                if results.get('status') == 'success' and cached:
+                    st.success("✅ Loaded previous analysis of these documents")
+                elif results.get('status') == 'success':
                     st.success(f"✅ Analysis complete in {results.get('duration_seconds', 0):.1f}s!")
                 else:
                     st.error(f"❌ Analysis failed: {results.get('error', 'Unknown error')}")
@@ -405,6 +933,9 @@ def main():
 
 def display_results(planner, results, config):
     """Display analysis results"""
+    stats = st.session_state.get('stats')
+    if stats is None:
+        stats = st.session_state.stats = planner_stats(planner)
     
     # Metrics
     st.header("📊 Analysis Summary")
@@ -419,12 +950,10 @@ def display_results(planner, results, config):
             st.metric("Duration", "N/A", help="Run a new analysis to see duration")
     
     with col2:
-        obligations_count = len(planner.obligations)
-        st.metric("Obligations", obligations_count)
+        st.metric("Obligations", stats.obligations)
     
     with col3:
-        mappings_count = sum(len(m) for m in planner.mappings.values())
-        st.metric("Mappings", mappings_count)
+        st.metric("Mappings", stats.mappings)
     
     with col4:
         status = results.get('status', 'unknown')
@@ -432,32 +961,32 @@ def display_results(planner, results, config):
     
     st.divider()
     
-    # Tabs for different views
-    tab1, tab2, tab3, tab4, tab5 = st.tabs([
-        "📝 Obligations",
-        "🔗 Mappings",
-        "📊 Diff Summary",
-        "✅ Actions",
-        "💾 Exports"
-    ])
-    
-    with tab1:
-        display_obligations(planner)
-    
-    with tab2:
-        display_mappings(planner, config)
-    
-    with tab3:
-        display_diff(planner)
-    
-    with tab4:
-        display_actions(planner, config)
+    # Identifies this pipeline run; keys the cached tables below
+    run_key = (id(planner), results.get('started_at'))
+    
+    # Only the selected view runs; st.tabs would execute every tab's body
+    # (table builds, exports) on each rerun
+    view = st.radio(
+        "View",
+        RESULT_VIEWS,
+        horizontal=True,
+        key='active_tab',
+        label_visibility="collapsed"
+    )
     
-    with tab5:
-        display_exports(planner, config)
+    if view == RESULT_VIEWS[0]:
+        display_obligations(planner, run_key)
+    elif view == RESULT_VIEWS[1]:
+        display_mappings(planner, config, run_key)
+    elif view == RESULT_VIEWS[2]:
+        display_diff(planner, run_key)
+    elif view == RESULT_VIEWS[3]:
+        display_actions(planner, config, run_key, stats.mapped_ids)
+    else:
+        display_exports(planner, config, run_key)
 
 
-def display_obligations(planner):
+def display_obligations(planner, run_key):
     """Display obligations table"""
     st.subheader("Extracted Obligations")
     
@@ -472,50 +1001,39 @@ def display_obligations(planner):
         default=['high', 'medium', 'low']
     )
     
-    # Build dataframe
-    data = []
-    for ob in planner.obligations:
-        if ob.severity in severity_filter:
-            data.append({
-                'Section': ob.section_id,
-                'Severity': ob.severity.upper(),
-                'Text': ob.text[:200] + '...',
-                'Modal Phrases': ', '.join(ob.modal_phrases[:3]),
-                'Deadline': '✓' if ob.has_deadline else '✗',
-                'Citations': ', '.join(ob.citations[:2]) if ob.citations else '-'
-            })
-    
-    df = pd.DataFrame(data)
+    # The full table is built once per run; filters only select rows
+    # (isin on the categorical compares its int8 codes)
+    df = _build_obligations_df(run_key, planner.obligations)
+    if len(severity_filter) < len(SEVERITY_NAMES):
+        mask = df['Severity'].isin([s.upper() for s in severity_filter])
+        df = df.loc[mask]
     
     # Style severity column with better visibility
-    def highlight_severity(row):
-        if row['Severity'] == 'HIGH':
-            # Light red background with dark text
-            return [
-                'background-color: rgba(254, 226, 226, 0.8); color: #991b1b; font-weight: 600;'
-            ] * len(row)
-        elif row['Severity'] == 'MEDIUM':
-            # Light orange background with dark text
-            return [
-                'background-color: rgba(254, 243, 199, 0.8); color: #92400e; font-weight: 600;'
-            ] * len(row)
-        else:
-            # Light green background with dark text
-            return [
-                'background-color: rgba(220, 252, 231, 0.8); color: #065f46; font-weight: 600;'
-            ] * len(row)
-    
     st.dataframe(
-        df.style.apply(highlight_severity, axis=1),
+        df.style.apply(highlight_severity, axis=None),
         use_container_width=True,
         height=400
     )
     
     # Stats
-    st.caption(f"Showing {len(data)} of {len(planner.obligations)} obligations")
+    st.caption(f"Showing {len(df)} of {len(planner.obligations)} obligations")
+
+
+def highlight_severity(df: pd.DataFrame) -> pd.DataFrame:
+    """Whole-table row styles from the Severity column, in one vectorized pass"""
+    styles = (
+        df['Severity'].astype(object).map(SEVERITY_ROW_STYLES)
+        .fillna(SEVERITY_ROW_STYLES['LOW'])
+        .to_numpy(dtype=object)
+    )
+    return pd.DataFrame(
+        np.broadcast_to(styles[:, None], df.shape),
+        index=df.index,
+        columns=df.columns
+    )
 
 
-def display_mappings(planner, config):
+def display_mappings(planner, config, run_key):
     """Display control mappings"""
     st.subheader("Control Mappings")
     
@@ -523,22 +1041,7 @@ def display_mappings(planner, config):
         st.warning("No mappings available")
         return
     
-    # Build flat list
-    all_mappings = []
-    for section_id, mappings in planner.mappings.items():
-        for mapping in mappings:
-            all_mappings.append({
-                'Section': section_id,
-                'Obligation': mapping.obligation_text[:100] + '...',
-                'Control ID': mapping.control_id,
-                'Control Title': mapping.control_title,
-                'Score': f"{mapping.score:.3f}",
-                'Cosine': f"{mapping.cosine_score:.3f}",
-                'Lexical': f"{mapping.lexical_score:.3f}",
-                'Status': mapping.status
-            })
-    
-    df = pd.DataFrame(all_mappings)
+    df = _build_mappings_df(run_key, planner.mappings)
     
     # Filter by status
     status_filter = st.multiselect(
@@ -552,7 +1055,7 @@ def display_mappings(planner, config):
     st.dataframe(df_filtered, use_container_width=True, height=400)
     
     # Interactive review (simplified for PoC)
-    st.caption(f"Showing {len(df_filtered)} of {len(all_mappings)} mappings")
+    st.caption(f"Showing {len(df_filtered)} of {len(df)} mappings")
     
     with st.expander("📝 Review Mapping (Demo)"):
         st.info("Full interactive review will be available in Alpha release")
@@ -563,7 +1066,7 @@ def display_mappings(planner, config):
             st.success(f"Review recorded: {action} by {reviewer_name}")
 
 
-def display_diff(planner):
+def display_diff(planner, run_key):
     """Display diff summary"""
     st.subheader("Document Diff Summary")
     
@@ -590,74 +1093,38 @@ def display_diff(planner):
     # Show changed sections
     st.subheader("Changed Sections")
     
+    # One table instead of an expander per section: a single Arrow payload
+    # however many sections changed
     changed = planner.diff_result.get_changed_sections()
     
-    for i, op in enumerate(changed[:10]):  # Limit to 10
-        with st.expander(f"{op.op.upper()} - Section {i+1}"):
-            if op.old_text:
-                st.markdown("**Old:**")
-                st.text('\n'.join(op.old_text[:3]))
-            
-            if op.new_text:
-                st.markdown("**New:**")
-                st.text('\n'.join(op.new_text[:3]))
+    df_diff = _build_diff_df(run_key, changed)
+    st.dataframe(df_diff, use_container_width=True, height=400)
+    
+    if len(changed) > DIFF_MAX_ROWS:
+        st.caption(f"Showing {DIFF_MAX_ROWS} of {len(changed)} changed sections")
 
 
-def display_actions(planner, config):
+def display_actions(planner, config, run_key, mapped_ids):
     """Display action plan"""
     st.subheader("Action Plan & Evidence Schedule")
     
-    # Generate actions
-    actions_agent = create_actions_agent(config.get('planner.default_due_days', 30))
-    
-    actions = actions_agent.generate_actions(
-        planner.obligations,
-        planner.mappings,
-        planner.mapper.controls
+    # Generate actions (once per pipeline run)
+    actions, evidence_runs = _action_plan(
+        run_key, config.get('planner.default_due_days', 30), planner, mapped_ids
     )
     
     # Actions table
     st.markdown("### 📋 Action Items")
     
-    actions_data = []
-    for action in actions:
-        actions_data.append({
-            'Summary': action.summary,
-            'Control ID': action.control_id,
-            'Owner': action.owner,
-            'Priority': action.priority.upper(),
-            'Due Date': action.due_date,
-            'System': action.system,
-            'Status': action.status
-        })
-    
-    df_actions = pd.DataFrame(actions_data)
+    df_actions = _build_actions_df(run_key, actions)
     st.dataframe(df_actions, use_container_width=True, height=300)
     
     # Evidence schedules
     st.markdown("### 📅 Evidence Collection Schedule")
     
-    # Get unique control IDs that are mapped
-    mapped_control_ids = set()
-    for maps in planner.mappings.values():
-        for m in maps:
-            if m.status in ['accepted', 'review']:
-                mapped_control_ids.add(m.control_id)
-    
-    # Get the actual Control objects for those IDs
-    controls_used = [
-        ctrl for ctrl in planner.mapper.controls
-        if ctrl.control_id in mapped_control_ids
-    ]
-    
-    if not controls_used:
+    if evidence_runs is None:
         st.info("No controls mapped yet. Evidence schedules will be generated once controls are mapped.")
     else:
-        evidence_runs = actions_agent.generate_evidence_schedules(
-            controls_used[:10],  # Limit for demo
-            cadence_preset='quarterly'
-        )
-        
         evidence_data = []
         for run in evidence_runs:
             evidence_data.append({
@@ -672,17 +1139,14 @@ def display_actions(planner, config):
         st.dataframe(df_evidence, use_container_width=True, height=250)
 
 
-def display_exports(planner, config):
+def display_exports(planner, config, run_key):
     """Display export options"""
     st.subheader("Export Data")
     
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        obligations_json = json.dumps(
-            [ob.to_dict() for ob in planner.obligations],
-            indent=2
-        )
+        obligations_json = _obligations_json(run_key, planner.obligations)
         st.download_button(
             "📥 Download Obligations (JSON)",
             obligations_json,
@@ -693,13 +1157,7 @@ def display_exports(planner, config):
         )
     
     with col2:
-        mappings_json = json.dumps(
-            {
-                section_id: [m.to_dict() for m in maps]
-                for section_id, maps in planner.mappings.items()
-            },
-            indent=2
-        )
+        mappings_json = _mappings_json(run_key, planner.mappings)
         st.download_button(
             "📥 Download Mappings (JSON)",
             mappings_json,
@@ -710,18 +1168,31 @@ def display_exports(planner, config):
         )
     
     with col3:
+        # Make entries still in the logger's write buffer part of the download
+        get_audit_logger().flush()
         audit_file = config.audit_dir / "audit.jsonl"
         if audit_file.exists():
-            with open(audit_file, 'r') as f:
-                audit_data = f.read()
-            st.download_button(
-                "📥 Download Audit Trail",
-                audit_data,
-                file_name="audit.jsonl",
-                mime="application/x-ndjson",
-                use_container_width=True,
-                type="primary"
-            )
+            audit_stat = audit_file.stat()
+            
+            # A large trail is not loaded on every rerun, only once asked for
+            if (audit_stat.st_size > AUDIT_PREPARE_THRESHOLD
+                    and not st.session_state.get('audit_download_ready')):
+                if st.button("📦 Prepare Audit Trail Download", use_container_width=True):
+                    st.session_state.audit_download_ready = True
+                    st.rerun()
+                st.caption(f"Audit trail is {audit_stat.st_size / 1024 / 1024:.0f} MB")
+            else:
+                audit_data = _read_audit_file(
+                    str(audit_file), audit_stat.st_size, audit_stat.st_mtime_ns
+                )
+                st.download_button(
+                    "📥 Download Audit Trail",
+                    audit_data,
+                    file_name="audit.jsonl",
+                    mime="application/x-ndjson",
+                    use_container_width=True,
+                    type="primary"
+                )
         else:
             st.info("No audit trail available yet")
     
@@ -731,7 +1202,6 @@ def display_exports(planner, config):
     st.subheader("🔒 Audit Trail Verification")
     
     if st.button("Verify Audit Chain"):
-        from utils.audit import get_audit_logger
         audit = get_audit_logger()
         is_valid, line_num = audit.verify_chain()
         
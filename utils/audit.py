@@ -3,46 +3,112 @@ RegDelta Audit Logger
 Tamper-evident append-only audit trail with SHA-256 hash chain
 """
 
+import os
+import sys
 import json
+import mmap
+import atexit
+import shutil
 import hashlib
 from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
 import logging
 import threading
 
 logger = logging.getLogger(__name__)
 
+# Faster JSON parsing when available; entries are always written (and their
+# canonical bytes hashed) with the json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
-def convert_to_serializable(obj):
-    """Recursively convert numpy types to Python native types"""
-    try:
-        import numpy as np
-        
-        if isinstance(obj, (np.integer, np.int32, np.int64)):
+# numpy is optional; without it there is nothing to convert
+try:
+    import numpy as np
+    _NUMPY_TYPES = (np.integer, np.floating, np.ndarray)
+except ImportError:
+    np = None
+    _NUMPY_TYPES = ()
+
+# Leaf types that never need converting
+_PASSTHROUGH_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# Entries buffered between flush+fsync of the audit file; log(durable=True)
+# syncs at once
+FSYNC_BATCH_SIZE = 32
+
+# Longest an appended entry waits (seconds) for the rest of its batch before
+# a timer syncs it
+FSYNC_MAX_DELAY = 100e-6
+
+# Write buffer for the audit file handle
+WRITE_BUFFER_SIZE = 1 << 16
+
+# Entry fields with few distinct values, interned when entries are read back
+_INTERNED_FIELDS = ('actor', 'action')
+
+
+def _needs_conversion(obj) -> bool:
+    """Whether obj holds any numpy value, at any depth"""
+    if type(obj) in _PASSTHROUGH_TYPES:
+        return False
+    if isinstance(obj, dict):
+        return any(_needs_conversion(value) for value in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return any(_needs_conversion(item) for item in obj)
+    return isinstance(obj, _NUMPY_TYPES)
+
+
+def _convert(obj):
+    """Rebuild obj with numpy values replaced by Python natives"""
+    if type(obj) in _PASSTHROUGH_TYPES:
+        return obj
+    if isinstance(obj, dict):
+        return {key: _convert(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_convert(item) for item in obj]
+    if isinstance(obj, tuple):
+        return tuple(_convert(item) for item in obj)
+    if np is not None:
+        if isinstance(obj, np.integer):
             return int(obj)
-        elif isinstance(obj, (np.floating, np.float32, np.float64)):
+        if isinstance(obj, np.floating):
             return float(obj)
-        elif isinstance(obj, np.ndarray):
+        if isinstance(obj, np.ndarray):
             return obj.tolist()
-        elif isinstance(obj, dict):
-            return {key: convert_to_serializable(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_to_serializable(item) for item in obj]
-        elif isinstance(obj, tuple):
-            return tuple(convert_to_serializable(item) for item in obj)
-        else:
-            return obj
-    except ImportError:
-        # If numpy not available, just return the object
-        if isinstance(obj, dict):
-            return {key: convert_to_serializable(value) for key, value in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_to_serializable(item) for item in obj]
-        elif isinstance(obj, tuple):
-            return tuple(convert_to_serializable(item) for item in obj)
-        else:
-            return obj
+    return obj
+
+
+def convert_to_serializable(obj):
+    """
+    Recursively convert numpy types to Python native types
+    
+    Audit payloads are usually plain Python already; those are returned
+    as-is after one scan instead of being rebuilt.
+    """
+    if not _needs_conversion(obj):
+        return obj
+    return _convert(obj)
+
+
+# hashlib.sha256 is OpenSSL's implementation (SHA-NI where the CPU has it)
+# unless Python was built without OpenSSL
+_SHA256_BACKEND = 'openssl' if hashlib.sha256.__module__ == '_hashlib' else 'builtin'
+
+
+def _loads(data):
+    """Parse one audit line, via orjson when it is installed"""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN, which json.dumps writes and orjson rejects
+            pass
+    return json.loads(data)
 
 
 class AuditLogger:
@@ -59,42 +125,144 @@ class AuditLogger:
             logger.info(f"Created new audit log: {self.audit_file}")
         
         self.last_hash = self._get_last_hash()
+        logger.debug(f"Audit hash chain using {_SHA256_BACKEND} SHA-256")
+        
+        # Long-lived buffered handle, opened on first write
+        self._fh = None
+        self._unsynced = 0
+        self._sync_timer = None
+        atexit.register(self.close)
     
     def _get_last_hash(self) -> str:
         """Get the last hash from the audit log"""
         if self.audit_file.stat().st_size == 0:
             return "0" * 64  # Genesis hash
         
-        # Read last line
+        # Read last line: one reverse scan for the newline before it
         with open(self.audit_file, 'rb') as f:
             try:
-                # Move to end and read backwards to find last line
-                f.seek(-2, 2)  # Skip final newline
-                while f.read(1) != b'\n':
-                    f.seek(-2, 1)
-                last_line = f.readline().decode('utf-8')
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    end = len(mm)
+                    if mm[end - 1:end] == b'\n':
+                        end -= 1  # Skip final newline
+                    start = mm.rfind(b'\n', 0, end) + 1
+                    last_line = mm[start:end]
                 
-                entry = json.loads(last_line)
+                entry = _loads(last_line)
                 return entry.get('sha256', "0" * 64)
-            except (OSError, json.JSONDecodeError):
+            except (OSError, ValueError):
                 # Empty file or corrupted
                 return "0" * 64
     
-    def _compute_hash(self, entry: Dict[str, Any]) -> str:
-        """Compute SHA-256 hash of entry including previous hash"""
-        # Create deterministic string representation
-        data = {
-            'ts': entry['ts'],
-            'actor': entry['actor'],
-            'action': entry['action'],
-            'payload': convert_to_serializable(entry['payload']),
-            'prev_sha256': entry['prev_sha256']
-        }
+    @staticmethod
+    def _canonical_bytes(entry: Dict[str, Any]) -> bytes:
+        """
+        Deterministic encoding of an entry, which is hashed as a whole
         
-        data_str = json.dumps(data, sort_keys=True, separators=(',', ':'))
-        return hashlib.sha256(data_str.encode('utf-8')).hexdigest()
+        The entry must not hold its sha256 yet, and the payload must already
+        be JSON-native (convert_to_serializable for new entries; parsed
+        entries always are).
+        """
+        return json.dumps(entry, sort_keys=True, separators=(',', ':')).encode('utf-8')
+    
+    def _compute_hash(self, canonical: bytes) -> str:
+        """
+        Compute SHA-256 hash of an entry's canonical bytes
+        
+        The whole entry is handed to hashlib as one contiguous buffer, and
+        hexdigest formats in C (cheaper than digest().hex()).
+        """
+        return hashlib.sha256(canonical).hexdigest()
+    
+    def _iter_lines(self):
+        """Raw lines of the audit file (with newline), read through mmap"""
+        with open(self.audit_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                size = len(mm)
+                start = 0
+                while start < size:
+                    end = mm.find(b'\n', start)
+                    end = size if end == -1 else end + 1
+                    yield mm[start:end]
+                    start = end
+    
+    def _iter_lines_reversed(self):
+        """Raw lines of the audit file (with newline), last line first"""
+        with open(self.audit_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = len(mm)
+                while end > 0:
+                    start = mm.rfind(b'\n', 0, end - 1) + 1
+                    yield mm[start:end]
+                    end = start
+    
+    def _append(self, data: bytes, durable: bool, count: int = 1):
+        """Append count entries' bytes to the audit file, syncing once per batch (lock held)"""
+        if self._fh is None:
+            self._fh = open(self.audit_file, 'ab', buffering=WRITE_BUFFER_SIZE)
+        
+        self._fh.write(data)
+        
+        self._unsynced += count
+        if durable or self._unsynced >= FSYNC_BATCH_SIZE:
+            self._sync()
+        elif self._sync_timer is None:
+            # Bound the wait of a batch that may never fill
+            self._sync_timer = threading.Timer(FSYNC_MAX_DELAY, self.sync)
+            self._sync_timer.daemon = True
+            self._sync_timer.start()
+    
+    def _sync(self):
+        """Flush and fsync pending appends (lock held)"""
+        if self._sync_timer is not None:
+            self._sync_timer.cancel()
+            self._sync_timer = None
+        
+        if self._fh is None or not self._unsynced:
+            return
+        
+        self._fh.flush()
+        try:
+            os.fsync(self._fh.fileno())
+        except OSError as e:
+            logger.warning(f"Failed to sync audit log: {e}")
+        self._unsynced = 0
+    
+    def flush(self):
+        """Hand buffered entries to the OS so readers of the file see them"""
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+    
+    def sync(self):
+        """Force appended entries to disk"""
+        with self._lock:
+            self._sync()
+    
+    def close(self):
+        """Sync and close the audit file; a later log() reopens it"""
+        with self._lock:
+            if self._fh is None:
+                return
+            
+            self._sync()
+            self._fh.close()
+            self._fh = None
+    
+    def __enter__(self):
+        return self
     
-    def log(self, actor: str, action: str, payload: Dict[str, Any]) -> str:
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+    
+    def log(self, actor: str, action: str, payload: Dict[str, Any],
+            durable: bool = False) -> str:
         """
         Log an audit entry (thread-safe)
         
@@ -102,36 +270,79 @@ class AuditLogger:
             actor: Who performed the action (user, agent, system)
             action: What action was performed
             payload: Additional context/data
+            durable: fsync before returning instead of with the next batch
         
         Returns:
             SHA-256 hash of the logged entry
         """
         with self._lock:  # Ensure atomic read-modify-write
-            # Convert payload to serializable format
-            serializable_payload = convert_to_serializable(payload)
-            
             # Use the in-memory last_hash (already updated from previous write)
-            entry = {
-                'ts': datetime.utcnow().isoformat() + 'Z',
-                'actor': actor,
-                'action': action,
-                'payload': serializable_payload,
-                'prev_sha256': self.last_hash
-            }
-            
-            # Compute hash
-            entry['sha256'] = self._compute_hash(entry)
+            sha256, line = self._encode_entry(actor, action, payload, self.last_hash)
             
-            # Append to file with flush
-            with open(self.audit_file, 'a', encoding='utf-8') as f:
-                f.write(json.dumps(entry, separators=(',', ':')) + '\n')
-                f.flush()  # Force flush to disk
+            # Buffered write on the persistent handle
+            self._append(line, durable)
             
             # Update last hash
-            self.last_hash = entry['sha256']
+            self.last_hash = sha256
             
             logger.debug(f"Audit log: {action} by {actor}")
-            return entry['sha256']
+            return sha256
+    
+    def log_batch(self, entries: Iterable[Tuple[str, str, Dict[str, Any]]],
+                  durable: bool = False) -> List[str]:
+        """
+        Log several audit entries in one locked section and one write
+        
+        Args:
+            entries: (actor, action, payload) tuples, chained in order
+            durable: fsync before returning instead of with the next batch
+        
+        Returns:
+            SHA-256 hashes of the logged entries
+        """
+        with self._lock:
+            hashes = []
+            lines = []
+            prev_hash = self.last_hash
+            
+            for actor, action, payload in entries:
+                prev_hash, line = self._encode_entry(actor, action, payload, prev_hash)
+                hashes.append(prev_hash)
+                lines.append(line)
+            
+            if not lines:
+                return hashes
+            
+            self._append(b''.join(lines), durable, count=len(lines))
+            self.last_hash = prev_hash
+            
+            logger.debug(f"Audit log: batch of {len(lines)} entries")
+            return hashes
+    
+    def _encode_entry(self, actor: str, action: str, payload: Dict[str, Any],
+                      prev_hash: str) -> Tuple[str, bytes]:
+        """
+        Build one entry chained to prev_hash
+        
+        Returns:
+            (SHA-256 hash of the entry, its line as bytes)
+        """
+        # Convert payload to serializable format
+        serializable_payload = convert_to_serializable(payload)
+        
+        entry = {
+            'ts': datetime.utcnow().isoformat() + 'Z',
+            'actor': actor,
+            'action': action,
+            'payload': serializable_payload,
+            'prev_sha256': prev_hash
+        }
+        
+        # Compute hash
+        entry['sha256'] = self._compute_hash(self._canonical_bytes(entry))
+        
+        line = json.dumps(entry, separators=(',', ':')) + '\n'
+        return entry['sha256'], line.encode('utf-8')
     
     def verify_chain(self) -> tuple[bool, Optional[int]]:
         """
@@ -140,38 +351,88 @@ class AuditLogger:
         Returns:
             (is_valid, first_invalid_line_number)
         """
+        self.flush()
         if self.audit_file.stat().st_size == 0:
             return True, None
         
         prev_hash = "0" * 64
         line_num = 0
         
-        with open(self.audit_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                line_num += 1
-                try:
+        # Each line is parsed once and hashed from its canonical bytes; the
+        # parsed payload is JSON-native, so no conversion pass is needed
+        for line in self._iter_lines():
+            line_num += 1
+            try:
+                entry = _loads(line)
+                
+                # Check previous hash matches
+                if entry['prev_sha256'] != prev_hash:
+                    logger.error(f"Hash chain broken at line {line_num}: prev_hash mismatch")
+                    return False, line_num
+                
+                # Verify hash over the entry minus its recorded hash
+                recorded_hash = entry.pop('sha256')
+                expected_hash = self._compute_hash(self._canonical_bytes(entry))
+                if recorded_hash != expected_hash and orjson is not None:
+                    # orjson reads integers wider than 64 bits as floats;
+                    # re-check with the json module before reporting
                     entry = json.loads(line)
-                    
-                    # Check previous hash matches
-                    if entry['prev_sha256'] != prev_hash:
-                        logger.error(f"Hash chain broken at line {line_num}: prev_hash mismatch")
-                        return False, line_num
-                    
-                    # Verify hash
-                    expected_hash = self._compute_hash(entry)
-                    if entry['sha256'] != expected_hash:
-                        logger.error(f"Hash chain broken at line {line_num}: hash mismatch")
-                        return False, line_num
-                    
-                    prev_hash = entry['sha256']
-                    
-                except json.JSONDecodeError:
-                    logger.error(f"Hash chain broken at line {line_num}: invalid JSON")
+                    del entry['sha256']
+                    expected_hash = self._compute_hash(self._canonical_bytes(entry))
+                if recorded_hash != expected_hash:
+                    logger.error(f"Hash chain broken at line {line_num}: hash mismatch")
                     return False, line_num
+                
+                prev_hash = recorded_hash
+                
+            except json.JSONDecodeError:
+                logger.error(f"Hash chain broken at line {line_num}: invalid JSON")
+                return False, line_num
         
         logger.info(f"Audit chain verified: {line_num} entries OK")
         return True, None
     
+    @staticmethod
+    def _parse_entries(lines: Iterable[bytes],
+                       action_filter: Optional[str],
+                       actor_filter: Optional[str]) -> Iterator[Dict[str, Any]]:
+        """Parse and filter raw lines, skipping invalid JSON"""
+        for line in lines:
+            try:
+                entry = _loads(line)
+            except json.JSONDecodeError:
+                continue
+            
+            # Apply filters
+            if action_filter and entry['action'] != action_filter:
+                continue
+            if actor_filter and entry['actor'] != actor_filter:
+                continue
+            
+            # Share one string object per actor/action across entries
+            for field in _INTERNED_FIELDS:
+                value = entry.get(field)
+                if type(value) is str:
+                    entry[field] = sys.intern(value)
+            
+            yield entry
+    
+    def iter_entries(self,
+                     action_filter: Optional[str] = None,
+                     actor_filter: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Stream audit entries in log order with optional filtering
+        
+        Args:
+            action_filter: Filter by action type
+            actor_filter: Filter by actor
+        
+        Yields:
+            Audit entries, one parsed line at a time
+        """
+        self.flush()
+        yield from self._parse_entries(self._iter_lines(), action_filter, actor_filter)
+    
     def get_entries(self, 
                     action_filter: Optional[str] = None,
                     actor_filter: Optional[str] = None,
@@ -187,40 +448,29 @@ class AuditLogger:
         Returns:
             List of audit entries
         """
-        entries = []
+        if not limit:
+            return list(self.iter_entries(action_filter, actor_filter))
         
-        if self.audit_file.stat().st_size == 0:
-            return entries
+        self.flush()
         
-        with open(self.audit_file, 'r', encoding='utf-8') as f:
-            for line in f:
-                try:
-                    entry = json.loads(line)
-                    
-                    # Apply filters
-                    if action_filter and entry['action'] != action_filter:
-                        continue
-                    if actor_filter and entry['actor'] != actor_filter:
-                        continue
-                    
-                    entries.append(entry)
-                    
-                except json.JSONDecodeError:
-                    continue
-        
-        # Return most recent if limit specified
-        if limit:
-            entries = entries[-limit:]
+        # Only the most recent entries are wanted: read from the end of the
+        # file and stop once enough have matched
+        entries = list(islice(
+            self._parse_entries(self._iter_lines_reversed(), action_filter, actor_filter),
+            limit
+        ))
+        entries.reverse()
         
         return entries
     
     def export_audit_trail(self, output_file: Path):
         """Export full audit trail to a separate file"""
         output_file.parent.mkdir(parents=True, exist_ok=True)
+        self.flush()
         
-        with open(self.audit_file, 'r', encoding='utf-8') as src:
-            with open(output_file, 'w', encoding='utf-8') as dst:
-                dst.write(src.read())
+        # Byte-for-byte copy without reading the trail into memory
+        # (sendfile in the kernel on Linux)
+        shutil.copyfile(self.audit_file, output_file)
         
         logger.info(f"Exported audit trail to {output_file}")
 
@@ -4,18 +4,26 @@ Loads and validates configuration from config.yml
 """
 
 import yaml
+from functools import cached_property
 from pathlib import Path
 from typing import Dict, Any, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Prefer the libyaml-backed parser when available
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 class Config:
     """Singleton configuration loader"""
     
     _instance: Optional['Config'] = None
     _config: Dict[str, Any] = {}
+    _flat: Dict[str, Any] = {}  # dot-notation key -> value, for get()
     
     def __new__(cls, config_path: Optional[str] = None):
         if cls._instance is None:
@@ -38,10 +46,38 @@ class Config:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
         with open(config_path, 'r', encoding='utf-8') as f:
-            self._config = yaml.safe_load(f)
+            self._config = yaml.load(f, Loader=_YamlLoader)
         
         logger.info(f"Loaded configuration from {config_path}")
         self._validate()
+        
+        self._flat = self._flatten(self._config)
+        
+        # Drop Path values memoized from a previous load
+        for name, attr in vars(Config).items():
+            if isinstance(attr, cached_property):
+                self.__dict__.pop(name, None)
+    
+    @staticmethod
+    def _flatten(config: Dict[str, Any], prefix: str = '') -> Dict[str, Any]:
+        """
+        Map every dot-notation key path to its value
+        
+        Sections are included as well as leaves, so get('mapping') still
+        returns the nested dict. None values are left out and fall back to
+        the default in get().
+        """
+        flat = {}
+        for key, value in config.items():
+            if value is None:
+                continue
+            
+            path = f"{prefix}{key}"
+            flat[path] = value
+            if isinstance(value, dict):
+                flat.update(Config._flatten(value, f"{path}."))
+        
+        return flat
     
     def _validate(self):
         """Validate required configuration keys"""
@@ -52,36 +88,25 @@ class Config:
     
     def get(self, key: str, default: Any = None) -> Any:
         """Get configuration value by dot-notation key (e.g., 'storage.mode')"""
-        keys = key.split('.')
-        value = self._config
-        
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-                if value is None:
-                    return default
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key, default)
     
     @property
     def storage_mode(self) -> str:
         return self.get('storage.mode', 'json')
     
-    @property
+    @cached_property
     def data_dir(self) -> Path:
         return Path(self.get('storage.data_dir', 'data'))
     
-    @property
+    @cached_property
     def audit_dir(self) -> Path:
         return Path(self.get('storage.audit_dir', 'audit'))
     
-    @property
+    @cached_property
     def catalog_dir(self) -> Path:
         return Path(self.get('controls.catalog_dir', 'catalogs'))
     
-    @property
+    @cached_property
     def scenarios_dir(self) -> Path:
         return Path(self.get('scenario.scenarios_dir', 'scenarios'))
     
@@ -89,7 +114,7 @@ class Config:
     def catalogs(self) -> list:
         return self.get('controls.catalogs', [])
     
-    @property
+    @cached_property
     def lexicon_file(self) -> Path:
         return Path(self.get('lexicon.file', 'lexicon.yml'))
     
@@ -127,7 +152,7 @@ class Config:
     def log_level(self) -> str:
         return self.get('logging.level', 'INFO')
     
-    @property
+    @cached_property
     def log_file(self) -> Path:
         return Path(self.get('logging.file', 'logs/regdelta.log'))
     
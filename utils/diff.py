@@ -4,14 +4,29 @@ Paragraph-level document diffing with opcodes
 """
 
 import difflib
-from typing import List, Dict, Any
+from functools import cached_property
+from typing import List, Dict, Any, Iterator, Sequence, Union
 from dataclasses import dataclass
 import logging
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
 
+# C port of difflib's matcher when installed (same opcodes)
+try:
+    from cdifflib import CSequenceMatcher as _SequenceMatcher
+except ImportError:
+    _SequenceMatcher = difflib.SequenceMatcher
+
+# Opcode tags are stored as small ints (index into OP_NAMES) and only
+# converted to names when an op is materialized
+OP_NAMES = ('equal', 'insert', 'delete', 'replace')
+OP_CODES = {name: code for code, name in enumerate(OP_NAMES)}
+OP_EQUAL, OP_INSERT, OP_DELETE, OP_REPLACE = range(len(OP_NAMES))
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class DiffOp:
     """Represents a single diff operation"""
     op: str  # 'equal', 'insert', 'delete', 'replace'
@@ -46,67 +61,128 @@ class DiffOp:
         return "Unknown"
 
 
+class DiffOpArray:
+    """
+    Structure-of-arrays container for diff operations
+    
+    Opcode tags and the four range bounds are NumPy arrays; an op's text is
+    sliced from the paragraph lists only when it is indexed or iterated.
+    It is a read-only sequence: len(), iteration, integer indexing and
+    slicing (which returns a list of DiffOp) work, but it cannot be
+    appended to or modified in place.
+    """
+    
+    def __init__(self,
+                 old_paragraphs: List[str],
+                 new_paragraphs: List[str],
+                 opcodes: Sequence[tuple] = ()):
+        self.old_paragraphs = old_paragraphs
+        self.new_paragraphs = new_paragraphs
+        
+        self.op_codes = np.array([OP_CODES[tag] for tag, *_ in opcodes], dtype=np.uint8)
+        bounds = np.array([bound for _, *bound in opcodes], dtype=np.int32).reshape(-1, 4)
+        self.old_starts, self.old_ends, self.new_starts, self.new_ends = (
+            np.ascontiguousarray(column) for column in bounds.T
+        )
+    
+    def __len__(self) -> int:
+        return len(self.op_codes)
+    
+    def __getitem__(self, idx: Union[int, slice]) -> Union[DiffOp, List[DiffOp]]:
+        if isinstance(idx, slice):
+            return [self[i] for i in range(*idx.indices(len(self)))]
+        
+        old_start, old_end = int(self.old_starts[idx]), int(self.old_ends[idx])
+        new_start, new_end = int(self.new_starts[idx]), int(self.new_ends[idx])
+        return DiffOp(
+            op=OP_NAMES[self.op_codes[idx]],
+            old_start=old_start,
+            old_end=old_end,
+            new_start=new_start,
+            new_end=new_end,
+            old_text=self.old_paragraphs[old_start:old_end],
+            new_text=self.new_paragraphs[new_start:new_end]
+        )
+    
+    def __iter__(self) -> Iterator[DiffOp]:
+        for idx in range(len(self)):
+            yield self[idx]
+
+
 class DocumentDiff:
     """Paragraph-level document differ"""
     
     def __init__(self, old_paragraphs: List[str], new_paragraphs: List[str]):
         self.old_paragraphs = old_paragraphs
         self.new_paragraphs = new_paragraphs
-        self.ops: List[DiffOp] = []
+        self.ops = DiffOpArray(old_paragraphs, new_paragraphs)
         self._compute_diff()
     
     def _compute_diff(self):
         """Compute diff operations using SequenceMatcher"""
-        matcher = difflib.SequenceMatcher(
-            None,
-            self.old_paragraphs,
-            self.new_paragraphs,
-            autojunk=False
-        )
+        # Match on small int ids instead of the paragraph strings; equal
+        # paragraphs share an id, so the opcodes are unchanged but the
+        # matcher hashes and compares ints
+        ids: Dict[str, int] = {}
+        old_ids = [ids.setdefault(p, len(ids)) for p in self.old_paragraphs]
+        new_ids = [ids.setdefault(p, len(ids)) for p in self.new_paragraphs]
+        
+        # Keep one string per distinct paragraph: repeated boilerplate and
+        # paragraphs unchanged between the documents share a single object
+        # in both lists (and in the op text sliced from them)
+        vocab = list(ids)
+        self.old_paragraphs = [vocab[i] for i in old_ids]
+        self.new_paragraphs = [vocab[i] for i in new_ids]
         
-        for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
-            op = DiffOp(
-                op=tag,
-                old_start=old_start,
-                old_end=old_end,
-                new_start=new_start,
-                new_end=new_end,
-                old_text=self.old_paragraphs[old_start:old_end],
-                new_text=self.new_paragraphs[new_start:new_end]
-            )
-            self.ops.append(op)
+        matcher = _SequenceMatcher(None, old_ids, new_ids, autojunk=False)
+        
+        self.ops = DiffOpArray(
+            self.old_paragraphs, self.new_paragraphs, matcher.get_opcodes()
+        )
         
         logger.info(f"Computed diff: {len(self.ops)} operations")
     
-    def get_summary(self) -> Dict[str, int]:
-        """Get summary counts of diff operations"""
-        summary = {
-            'equal': 0,
-            'insert': 0,
-            'delete': 0,
-            'replace': 0,
-            'total_ops': len(self.ops)
-        }
+    @cached_property
+    def summary(self) -> Dict[str, int]:
+        """Summary counts of diff operations, computed once per diff"""
+        ops = self.ops
+        counts = np.bincount(ops.op_codes, minlength=len(OP_NAMES))
         
-        for op in self.ops:
-            summary[op.op] += 1
+        summary = {name: int(counts[code]) for code, name in enumerate(OP_NAMES)}
+        summary['total_ops'] = len(ops)
         
         # Calculate paragraphs affected
-        summary['paragraphs_added'] = sum(
-            len(op.new_text) for op in self.ops if op.op in ['insert', 'replace']
+        old_lengths = ops.old_ends - ops.old_starts
+        new_lengths = ops.new_ends - ops.new_starts
+        summary['paragraphs_added'] = int(
+            new_lengths[np.isin(ops.op_codes, (OP_INSERT, OP_REPLACE))].sum()
         )
-        summary['paragraphs_removed'] = sum(
-            len(op.old_text) for op in self.ops if op.op in ['delete', 'replace']
+        summary['paragraphs_removed'] = int(
+            old_lengths[np.isin(ops.op_codes, (OP_DELETE, OP_REPLACE))].sum()
         )
-        summary['paragraphs_unchanged'] = sum(
-            len(op.old_text) for op in self.ops if op.op == 'equal'
+        summary['paragraphs_unchanged'] = int(
+            old_lengths[ops.op_codes == OP_EQUAL].sum()
         )
         
         return summary
     
+    @cached_property
+    def _changed_indices(self) -> np.ndarray:
+        """Positions in ops of every non-equal operation"""
+        return np.flatnonzero(self.ops.op_codes != OP_EQUAL)
+    
+    @cached_property
+    def changed_sections(self) -> List[DiffOp]:
+        """Changed sections (excluding 'equal'), computed once per diff"""
+        return [self.ops[i] for i in self._changed_indices]
+    
+    def get_summary(self) -> Dict[str, int]:
+        """Get summary counts of diff operations"""
+        return dict(self.summary)  # A copy, so callers can't alter the cached counts
+    
     def get_changed_sections(self) -> List[DiffOp]:
         """Get only the changed sections (exclude 'equal')"""
-        return [op for op in self.ops if op.op != 'equal']
+        return list(self.changed_sections)  # A copy, as for get_summary
     
     def get_changes_with_context(self, context_lines: int = 2) -> List[Dict[str, Any]]:
         """
@@ -119,23 +195,27 @@ class DocumentDiff:
             List of change blocks with context
         """
         changes = []
+        ops = self.ops
+        is_equal = ops.op_codes == OP_EQUAL
         
-        for i, op in enumerate(self.ops):
-            if op.op == 'equal':
-                continue
+        def equal_text(j: int) -> List[str]:
+            return self.old_paragraphs[ops.old_starts[j]:ops.old_ends[j]]
+        
+        for i in self._changed_indices:
+            op = ops[i]
             
             # Find context before
             context_before = []
             for j in range(i - 1, -1, -1):
-                if self.ops[j].op == 'equal':
-                    context_before = self.ops[j].old_text[-context_lines:]
+                if is_equal[j]:
+                    context_before = equal_text(j)[-context_lines:]
                     break
             
             # Find context after
             context_after = []
-            for j in range(i + 1, len(self.ops)):
-                if self.ops[j].op == 'equal':
-                    context_after = self.ops[j].old_text[:context_lines]
+            for j in range(i + 1, len(ops)):
+                if is_equal[j]:
+                    context_after = equal_text(j)[:context_lines]
                     break
             
             changes.append({
@@ -154,10 +234,11 @@ class DocumentDiff:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert entire diff to dictionary"""
+        operations = [op.to_dict() for op in self.ops]
         return {
             'summary': self.get_summary(),
-            'operations': [op.to_dict() for op in self.ops],
-            'changed_sections': [op.to_dict() for op in self.get_changed_sections()]
+            'operations': operations,
+            'changed_sections': [operations[i] for i in self._changed_indices]
         }
     
     def get_unified_diff(self, old_label: str = "baseline", new_label: str = "new") -> str:
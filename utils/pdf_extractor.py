@@ -5,19 +5,61 @@ Fallback extraction with PyMuPDF (primary) and pdfplumber (fallback)
 
 import logging
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import Optional, Tuple, Callable
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 import re
 
 logger = logging.getLogger(__name__)
 
+# Page workers never fork the caller: inside the Streamlit server another
+# thread may hold a lock at that moment, and the copy in the worker would
+# never be released (spawn is the fallback where forkserver is unavailable)
+_POOL_CONTEXT = multiprocessing.get_context(
+    'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+)
 
-def extract_text(pdf_path: Path, skip_on_error: bool = True) -> Tuple[Optional[str], str]:
+# With n_workers > 1, documents with more pages than this are extracted by a
+# process pool, with at least this many pages per worker. Opt-in: each
+# worker re-opens and re-parses the whole PDF, so the pool only pays off
+# for long documents whose per-page extraction is slow
+PARALLEL_MIN_PAGES = 64
+
+# Whitespace normalization
+_BLANK_LINES_RE = re.compile(r'\n{3,}')
+_SPACE_RUN_RE = re.compile(r' {2,}')
+
+# Section patterns common in regulatory docs, compiled once as one split
+# pattern. Patterns: "1.2.3 Title", "Requirement 1.1:", "Article 5:", etc.
+# Each is written so a digit or letter run can be matched only one way:
+# backtracking stays linear in the run's length (the "1.2.3" pattern used
+# to be \d+\.\d+\.?\d*, which is quadratic on a long run of digits).
+_SECTION_PATTERNS = [
+    r'\n(?=\d+\.\d+(?:\.\d*)?\s+[A-Z])',  # 1.2.3 Title
+    r'\n(?=Requirement\s+\d+)',        # Requirement 1
+    r'\n(?=Section\s+\d+)',            # Section 1
+    r'\n(?=Article\s+\d+)',            # Article 1
+    r'\n(?=\d+\.\s+[A-Z])',            # 1. Title
+    r'\n(?=[A-Z][a-z]+\s+\d+:)',       # Clause 1:
+    r'\n\n+'                            # Double newlines
+]
+_SECTION_RE = re.compile('|'.join(_SECTION_PATTERNS))
+
+# Sentence boundaries, for splitting overlong chunks
+_SENTENCE_RE = re.compile(r'(?<=[.!?])\s+(?=[A-Z])')
+
+
+def extract_text(pdf_path: Path, skip_on_error: bool = True,
+                 n_workers: int = 1) -> Tuple[Optional[str], str]:
     """
     Extract text from PDF using fallback strategy
     
     Args:
         pdf_path: Path to PDF file
         skip_on_error: If True, return partial results on error; if False, raise exception
+        n_workers: Worker processes for documents over PARALLEL_MIN_PAGES
+            pages (default: serial)
     
     Returns:
         (extracted_text, extractor_used)
@@ -35,7 +77,7 @@ def extract_text(pdf_path: Path, skip_on_error: bool = True) -> Tuple[Optional[s
     for extractor_name, extractor_func in extractors:
         try:
             logger.info(f"Attempting extraction with {extractor_name}: {pdf_path.name}")
-            text = extractor_func(pdf_path)
+            text = extractor_func(pdf_path, n_workers)
             
             if text and len(text.strip()) > 0:
                 logger.info(f"Successfully extracted {len(text)} chars with {extractor_name}")
@@ -56,40 +98,117 @@ def extract_text(pdf_path: Path, skip_on_error: bool = True) -> Tuple[Optional[s
         raise RuntimeError(f"Failed to extract text from {pdf_path.name}") from last_error
 
 
-def _extract_with_pymupdf(pdf_path: Path) -> str:
+def _extract_with_pymupdf(pdf_path: Path, n_workers: int = 1) -> str:
     """Extract text using PyMuPDF (fitz)"""
     try:
         import fitz  # PyMuPDF
     except ImportError:
         raise ImportError("PyMuPDF not installed. Install with: pip install PyMuPDF")
     
-    doc = fitz.open(pdf_path)
-    text_parts = []
+    # Pages are joined as they are read, and the document is closed even
+    # if a page fails to extract
+    with fitz.open(pdf_path) as doc:
+        page_count = len(doc)
+        if n_workers <= 1 or page_count <= PARALLEL_MIN_PAGES:
+            return "\n".join(page.get_text() for page in doc)
     
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        text_parts.append(page.get_text())
-    
-    doc.close()
-    return "\n".join(text_parts)
+    return _extract_pages_parallel(pdf_path, page_count, _pymupdf_pages, n_workers)
 
 
-def _extract_with_pdfplumber(pdf_path: Path) -> str:
+def _extract_with_pdfplumber(pdf_path: Path, n_workers: int = 1) -> str:
     """Extract text using pdfplumber (fallback)"""
     try:
         import pdfplumber
     except ImportError:
         raise ImportError("pdfplumber not installed. Install with: pip install pdfplumber")
     
-    text_parts = []
-    
     with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if text:
-                text_parts.append(text)
+        page_count = len(pdf.pages)
+        if n_workers <= 1 or page_count <= PARALLEL_MIN_PAGES:
+            texts = (page.extract_text() for page in pdf.pages)
+            return "\n".join(text for text in texts if text)
+    
+    return _extract_pages_parallel(pdf_path, page_count, _pdfplumber_pages, n_workers)
+
+
+def _extract_pages_parallel(pdf_path: Path, page_count: int,
+                            extract_shard: Callable[[tuple], list],
+                            max_workers: int) -> str:
+    """
+    Extract a long document's text in contiguous page shards
+    
+    Each worker process opens its own handle on the PDF (PyMuPDF documents
+    can't be shared across threads, and pdfplumber holds the GIL). Falls
+    back to a single serial pass if the pool fails.
+    """
+    n_workers = min(max_workers, -(-page_count // PARALLEL_MIN_PAGES))
+    
+    if n_workers > 1:
+        shard_size = -(-page_count // n_workers)  # Ceiling division
+        shards = [
+            (str(pdf_path), start, min(start + shard_size, page_count))
+            for start in range(0, page_count, shard_size)
+        ]
+        
+        try:
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=_POOL_CONTEXT) as executor:
+                shard_texts = list(executor.map(extract_shard, shards))
+            return "\n".join(text for texts in shard_texts for text in texts)
+        except (BrokenProcessPool, OSError) as e:
+            # The pool itself failed; errors from page extraction propagate
+            # to extract_text's next extractor as before
+            logger.warning(f"Parallel page extraction failed, falling back to serial: {e}")
+    
+    return "\n".join(extract_shard((str(pdf_path), 0, page_count)))
+
+
+def _pymupdf_pages(shard: tuple[str, int, int]) -> list[str]:
+    """Text of pages [start, stop) of a PDF via PyMuPDF"""
+    import fitz
+    
+    path, start, stop = shard
+    with fitz.open(path) as doc:
+        return [doc[page_num].get_text() for page_num in range(start, stop)]
+
+
+def _pdfplumber_pages(shard: tuple[str, int, int]) -> list[str]:
+    """Text of pages [start, stop) of a PDF via pdfplumber (empty pages dropped)"""
+    import pdfplumber
+    
+    path, start, stop = shard
+    # pdfplumber numbers the pages to parse from 1
+    with pdfplumber.open(path, pages=list(range(start + 1, stop + 1))) as pdf:
+        texts = (page.extract_text() for page in pdf.pages)
+        return [text for text in texts if text]
+
+
+def _nonempty_stripped(pieces: list[str]) -> list[str]:
+    """Stripped pieces, without the empty ones"""
+    return [piece for piece in map(str.strip, pieces) if piece]
+
+
+def _merge_pieces(pieces: list[str], threshold: int, min_length: int, out: list[str]):
+    """
+    Join consecutive pieces into paragraphs, appending them to out
+    
+    A paragraph is flushed once its pieces' combined length (without the
+    joining spaces) reaches threshold; the trailing remainder is kept only
+    if its joined text reaches min_length. Only the group boundaries are
+    tracked while scanning, and each paragraph is joined once.
+    """
+    start = 0
+    total = 0
+    for end, length in enumerate(map(len, pieces), 1):
+        total += length
+        if total >= threshold:
+            out.append(' '.join(pieces[start:end]))
+            start = end
+            total = 0
     
-    return "\n".join(text_parts)
+    if start < len(pieces):
+        para_text = ' '.join(pieces[start:])
+        if len(para_text) >= min_length:
+            out.append(para_text)
 
 
 def paragraphize(text: str, min_length: int = 50, max_length: int = 2000) -> list[str]:
@@ -105,28 +224,19 @@ def paragraphize(text: str, min_length: int = 50, max_length: int = 2000) -> lis
         List of paragraph strings
     """
     # First, normalize whitespace
-    text = re.sub(r'\r\n', '\n', text)
-    text = re.sub(r'\n{3,}', '\n\n', text)
-    text = re.sub(r' {2,}', ' ', text)
-    
-    # Split on various section patterns common in regulatory docs
-    # Patterns: "1.2.3 Title", "Requirement 1.1:", "Article 5:", etc.
-    section_patterns = [
-        r'\n(?=\d+\.\d+\.?\d*\s+[A-Z])',  # 1.2.3 Title
-        r'\n(?=Requirement\s+\d+)',        # Requirement 1
-        r'\n(?=Section\s+\d+)',            # Section 1
-        r'\n(?=Article\s+\d+)',            # Article 1
-        r'\n(?=\d+\.\s+[A-Z])',            # 1. Title
-        r'\n(?=[A-Z][a-z]+\s+\d+:)',       # Clause 1:
-        r'\n\n+'                            # Double newlines
-    ]
+    text = text.replace('\r\n', '\n')
+    text = _BLANK_LINES_RE.sub('\n\n', text)
+    text = _SPACE_RUN_RE.sub(' ', text)
     
-    # Combine patterns and split
-    combined_pattern = '|'.join(section_patterns)
-    chunks = re.split(combined_pattern, text)
+    # Split on section boundaries
+    chunks = _SECTION_RE.split(text)
     
     paragraphs = []
     
+    # Pieces are merged until their combined length reaches min_length;
+    # a run that passes max_length first is flushed as it stands
+    sentence_threshold = min(min_length, max_length + 1)
+    
     for chunk in chunks:
         chunk = chunk.strip()
         
@@ -137,37 +247,8 @@ def paragraphize(text: str, min_length: int = 50, max_length: int = 2000) -> lis
         # If chunk is too long, split by sentences
         if len(chunk) > max_length:
             # Split on sentence boundaries
-            sentences = re.split(r'(?<=[.!?])\s+(?=[A-Z])', chunk)
-            current_para = []
-            current_length = 0
-            
-            for sentence in sentences:
-                sentence = sentence.strip()
-                if not sentence:
-                    continue
-                
-                # Add sentence to current paragraph
-                current_para.append(sentence)
-                current_length += len(sentence)
-                
-                # If paragraph is long enough, flush it
-                if current_length >= min_length and current_length <= max_length:
-                    para_text = ' '.join(current_para)
-                    paragraphs.append(para_text)
-                    current_para = []
-                    current_length = 0
-                elif current_length > max_length:
-                    # Force flush even if not ideal
-                    para_text = ' '.join(current_para)
-                    paragraphs.append(para_text)
-                    current_para = []
-                    current_length = 0
-            
-            # Flush remaining sentences
-            if current_para:
-                para_text = ' '.join(current_para)
-                if len(para_text) >= min_length:
-                    paragraphs.append(para_text)
+            sentences = _nonempty_stripped(_SENTENCE_RE.split(chunk))
+            _merge_pieces(sentences, sentence_threshold, min_length, paragraphs)
         else:
             # Chunk is reasonable size, add as-is if long enough
             if len(chunk) >= min_length:
@@ -175,29 +256,8 @@ def paragraphize(text: str, min_length: int = 50, max_length: int = 2000) -> lis
     
     # If we got no paragraphs (very compact PDF), split by line breaks
     if not paragraphs:
-        lines = text.split('\n')
-        current_para = []
-        current_length = 0
-        
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
-            
-            current_para.append(line)
-            current_length += len(line)
-            
-            if current_length >= min_length:
-                para_text = ' '.join(current_para)
-                paragraphs.append(para_text)
-                current_para = []
-                current_length = 0
-        
-        # Flush remaining
-        if current_para:
-            para_text = ' '.join(current_para)
-            if len(para_text) >= min_length:
-                paragraphs.append(para_text)
+        lines = _nonempty_stripped(text.split('\n'))
+        _merge_pieces(lines, min_length, min_length, paragraphs)
     
     logger.info(f"Segmented text into {len(paragraphs)} paragraphs (min={min_length}, max={max_length})")
     return paragraphs